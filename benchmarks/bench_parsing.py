@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from scanners.html_parser import available_backends, extract_links_and_forms
+
+def build_page(size_mb):
+    """بناء صفحة HTML كبيرة تحتوي على روابط ونماذج"""
+    block = (
+        '<div class="item"><h2>Product {i}</h2>'
+        '<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit. '
+        'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.</p>'
+        '<a href="/item?id={i}">details</a> <a href="/cat/{i}/">category</a>'
+        '<table><tr><td>{i}</td><td>price</td><td>stock</td></tr></table>'
+        '{form}</div>\n'
+    )
+    form = (
+        '<form action="/cart" method="post"><input type="hidden" name="id" value="{i}">'
+        '<input name="qty" value="1"><select name="size"></select>'
+        '<input type="submit" name="add" value="Add"></form>'
+    )
+    target = int(size_mb * 1024 * 1024)
+    parts = ['<html><head><title>bench</title></head><body>']
+    length = len(parts[0])
+    i = 0
+    while length < target:
+        chunk = block.format(i=i, form=form.format(i=i) if i % 10 == 0 else '')
+        parts.append(chunk)
+        length += len(chunk)
+        i += 1
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+def bench_bs4(html):
+    """المسار السابق: بناء شجرة BeautifulSoup كاملة ثم البحث فيها"""
+    soup = BeautifulSoup(html, 'html.parser')
+    links = [a.get('href') for a in soup.find_all('a')]
+    forms = soup.find_all('form')
+    return len(links), len(forms)
+
+def bench_backend(backend):
+    def run(html):
+        extracted = extract_links_and_forms(html, backend)
+        return len(extracted['links']), len(extracted['forms'])
+    return run
+
+def measure(func, html, rounds):
+    """قياس أفضل زمن من عدة جولات"""
+    best = None
+    counts = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        counts = func(html)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, counts
+
+def main():
+    parser = argparse.ArgumentParser(description='HTML parsing throughput benchmark')
+    parser.add_argument('--size-mb', type=float, default=5, help='Page size in MB')
+    parser.add_argument('--rounds', type=int, default=3, help='Rounds per backend')
+    args = parser.parse_args()
+
+    html = build_page(args.size_mb)
+    size_mb = len(html) / (1024 * 1024)
+    print(f'Page size: {size_mb:.2f} MB')
+
+    candidates = [('bs4 html.parser (tree)', bench_bs4)]
+    candidates += [(f'{name} (stream)', bench_backend(name)) for name in available_backends()]
+
+    baseline = None
+    for name, func in candidates:
+        elapsed, (links, forms) = measure(func, html, args.rounds)
+        baseline = baseline or elapsed
+        print(
+            f'{name:<28} {elapsed:8.3f}s {size_mb / elapsed:8.2f} MB/s '
+            f'x{baseline / elapsed:5.1f}  links={links} forms={forms}'
+        )
+
+if __name__ == '__main__':
+    main()
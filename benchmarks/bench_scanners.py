@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from urllib.parse import urljoin, urlparse
+import argparse
+import io
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.testapp import TestApp
+from scanners.http_client import HTTPClient
+from scanners.metrics import Metrics
+from scanners.registry import SCANNERS, load_scanner
+
+# سجل النتائج خارج شجرة العمل بجانب قاعدة حالة المسح حتى لا يُضاف إلى المستودع خطأً
+DEFAULT_RESULTS = os.path.join(os.path.expanduser('~'), '.web-hack', 'bench-results.jsonl')
+# خاصية النتائج في كل ماسح (scan() في ماسح المنافذ يعيد قيمة منطقية)
+FINDINGS_ATTRIBUTE = {
+    'ports': 'results',
+    'vulnerability': 'vulnerabilities',
+    'xss': 'vulnerabilities',
+    'sqli': 'vulnerabilities',
+    'directory': 'findings'
+}
+
+def free_port():
+    """منفذ محلي مغلق لاختبار حالة closed في ماسح المنافذ"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def finding_key(name, finding):
+    """مفتاح النتيجة للمقارنة مع الثغرات المزروعة"""
+    if name == 'ports':
+        return finding['port'] if finding['state'] == 'open' else None
+    if name == 'vulnerability':
+        return finding['description']
+    if name == 'xss':
+        action = urljoin(finding['url'], finding['form_action'] or finding['url'])
+        return urlparse(action).path, finding['vulnerable_parameter']
+    if name == 'sqli':
+        return urlparse(finding['url']).path, finding['parameter']
+    if name == 'directory':
+        return urlparse(finding['url']).path
+    return None
+
+def build_scanner(name, app, client):
+    scanner_class = load_scanner(name)
+    if name == 'ports':
+        return scanner_class('127.0.0.1', f'{app.port},{free_port()}')
+    return scanner_class(app.url, client=client)
+
+def run_scanner(name, app):
+    """تشغيل ماسح واحد على التطبيق وقياس أدائه ودقته"""
+    metrics = Metrics()
+    client = HTTPClient(metrics=metrics)
+    scanner = build_scanner(name, app, client)
+    started = time.monotonic()
+    # مخرجات الماسح النصية لا تهم القياس
+    with redirect_stdout(io.StringIO()):
+        scanner.scan()
+    elapsed = time.monotonic() - started
+    client.close()
+
+    findings = getattr(scanner, FINDINGS_ATTRIBUTE[name])
+    requests = metrics.totals()['requests']
+    if name == 'ports':
+        requests = sum(scanner.port_states.values())
+    found = {finding_key(name, finding) for finding in findings} - {None}
+    expected = app.ground_truth(name)
+    detected = found & expected
+    return {
+        'wall_time': round(elapsed, 3),
+        'requests': requests,
+        'requests_per_second': round(requests / elapsed, 1) if elapsed else None,
+        'findings': len(findings),
+        'requests_per_finding': round(requests / len(detected), 1) if detected else None,
+        'recall': round(len(detected) / len(expected), 3) if expected else None,
+        'false_positives': len(found - expected),
+        'missed': sorted(str(key) for key in expected - found)
+    }
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_previous(path, config):
+    """آخر نتيجة محفوظة بنفس إعدادات القياس"""
+    previous = None
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('config') == config:
+                previous = record
+    return previous
+
+def compare(results, previous, tolerance):
+    """مقارنة بالتشغيل السابق: انخفاض الاكتشاف أو تباطؤ يتجاوز الهامش"""
+    regressions = []
+    for name, current in results.items():
+        before = (previous or {}).get('results', {}).get(name)
+        if not before:
+            continue
+        if (current['recall'] or 0) < (before['recall'] or 0):
+            regressions.append(f'{name}: recall {before["recall"]} -> {current["recall"]}')
+        if current['false_positives'] > before['false_positives']:
+            regressions.append(
+                f'{name}: false positives {before["false_positives"]} -> {current["false_positives"]}'
+            )
+        if before['wall_time'] and current['wall_time'] > before['wall_time'] * (1 + tolerance):
+            regressions.append(f'{name}: wall time {before["wall_time"]}s -> {current["wall_time"]}s')
+        if before['requests'] and current['requests'] > before['requests'] * (1 + tolerance):
+            regressions.append(f'{name}: requests {before["requests"]} -> {current["requests"]}')
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Scanner speed and detection benchmark on a local test app')
+    parser.add_argument('--scanners', default=','.join(SCANNERS),
+                        help='Comma separated scanners to benchmark')
+    parser.add_argument('--latency', type=float, default=0, help='Added server latency per request in ms')
+    parser.add_argument('--large-page-kb', type=int, default=256, help='Size of the large page')
+    parser.add_argument('--results', default=DEFAULT_RESULTS, help='Results history file (JSONL)')
+    parser.add_argument('--no-save', action='store_true', help='Do not append this run to the history')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed slowdown or request growth before flagging a regression')
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scanners.split(',') if name.strip()]
+    unknown = [name for name in names if name not in SCANNERS]
+    if unknown:
+        parser.error(f'Unknown scanners: {", ".join(unknown)}')
+    config = {'latency_ms': args.latency, 'large_page_kb': args.large_page_kb}
+
+    results = {}
+    with TestApp(latency=args.latency / 1000, large_page_kb=args.large_page_kb) as app:
+        print(f'Test app: {app.url}  latency {args.latency:.0f}ms')
+        print(f'{"scanner":<14} {"time":>8} {"requests":>9} {"req/s":>8} {"req/find":>9} '
+              f'{"recall":>7} {"FP":>4}')
+        for name in names:
+            result = results[name] = run_scanner(name, app)
+            print(
+                f'{name:<14} {result["wall_time"]:7.2f}s {result["requests"]:>9} '
+                f'{result["requests_per_second"] or 0:>8.1f} {result["requests_per_finding"] or "-":>9} '
+                f'{result["recall"]:>7.2f} {result["false_positives"]:>4}'
+            )
+            if result['missed']:
+                print(f'{"":<14} missed: {", ".join(result["missed"])}')
+
+    previous = load_previous(args.results, config)
+    regressions = compare(results, previous, args.tolerance)
+    if previous:
+        print(f'\nCompared with {previous.get("revision") or "previous run"} ({previous["time"]})')
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if not regressions:
+            print('No regressions')
+
+    if not args.no_save:
+        record = {
+            'time': datetime.now(timezone.utc).isoformat(),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'config': config,
+            'results': results
+        }
+        directory = os.path.dirname(args.results)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.results, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+        print(f'Results appended to {args.results}')
+
+    sys.exit(1 if regressions else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# سيناريوهات بدء التشغيل: الشيفرة، ميزانية الاستيراد بالمللي ثانية فوق زمن المفسر، والوحدات الممنوعة
+SCENARIOS = [
+    ('cli --help', 'import runpy, sys; sys.argv = ["web-hack.py", "--help"]\n'
+                   'try:\n    runpy.run_path("web-hack.py", run_name="__main__")\n'
+                   'except SystemExit:\n    pass',
+     50, ['scanners', 'rich', 'requests', 'bs4', 'nmap']),
+    ('import scanners', 'import scanners', 20, ['rich', 'requests', 'bs4', 'nmap']),
+    ('ports only', 'from scanners.orchestrator import ScanOrchestrator\n'
+                   'ScanOrchestrator("127.0.0.1", scan_type="custom", scanners=["ports"])',
+     250, ['requests', 'bs4', 'nmap']),
+    ('header check', 'from scanners import VulnerabilityScanner\n'
+                     'VulnerabilityScanner("http://127.0.0.1")',
+     400, ['bs4', 'nmap'])
+]
+
+def import_profile(code):
+    """تشغيل الشيفرة في مفسر جديد وإرجاع زمن الاستيراد الكلي والوحدات المحملة"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    total = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # الوحدات ذات المستوى الأعلى فقط لتجنب احتساب الزمن مرتين
+        if not name.startswith('  '):
+            total += int(cumulative)
+        modules.add(name.strip())
+    return total / 1000, modules
+
+def main():
+    parser = argparse.ArgumentParser(description='CLI startup and import time budget check')
+    parser.add_argument('--rounds', type=int, default=3, help='Rounds per scenario')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiply every budget, e.g. for slow CI machines')
+    args = parser.parse_args()
+
+    # زمن استيراد المفسر المجرد (site وencodings) يُطرح من كل سيناريو
+    baseline = min(import_profile('pass')[0] for _ in range(args.rounds))
+    print(f'Interpreter baseline: {baseline:.1f}ms')
+
+    failed = False
+    for name, code, budget, forbidden in SCENARIOS:
+        runs = [import_profile(code) for _ in range(args.rounds)]
+        elapsed = max(0.0, min(total for total, _ in runs) - baseline)
+        loaded = sorted(module for module in forbidden if module in runs[0][1])
+        limit = budget * args.scale
+        ok = elapsed <= limit and not loaded
+        failed = failed or not ok
+        status = 'OK' if ok else 'FAIL'
+        extra = f'  unexpected imports: {", ".join(loaded)}' if loaded else ''
+        print(f'{name:<16} {elapsed:8.1f}ms  budget {limit:6.0f}ms  {status}{extra}')
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import html
+import threading
+import time
+
+# الثغرات المزروعة في التطبيق: ما يجب أن يجده كل ماسح (المنفذ المفتوح يُحدد عند التشغيل)
+GROUND_TRUTH = {
+    'vulnerability': {
+        'Missing HSTS header',
+        'Missing X-Content-Type-Options header',
+        'Missing X-XSS-Protection header',
+        'HTML comments found that might reveal sensitive information',
+        'Software version information disclosed'
+    },
+    'xss': {('/search', 'q'), ('/comment', 'body'), ('/profile', 'name')},
+    'sqli': {('/item', 'id'), ('/order', 'ref')},
+    'directory': {'/admin/', '/.env', '/backup/', '/robots.txt', '/api/'}
+}
+
+HOME = '''<html><head><title>Bench Shop</title></head><body>
+<!-- build 2.3.1, deployed by ci -->
+<a href="/search?q=shoes">search</a> <a href="/item?id=1">item</a>
+<a href="/product?id=2">product</a> <a href="/catalog?page=1">catalog</a>
+<a href="/profile">profile</a> <a href="/orders">orders</a>
+<a href="/comment">comments</a> <a href="/large">all products</a>
+<form action="/search" method="get"><input name="q"><input name="lang" value="en">
+<input type="submit" value="Go"></form>
+<form action="/safe" method="get"><input name="x"></form>
+</body></html>'''
+
+COMMENT_FORM = (
+    '<form action="/comment" method="post"><input name="author" value="anon">'
+    '<textarea name="body"></textarea><input type="submit" name="send" value="Send"></form>'
+)
+
+class Handler(BaseHTTPRequestHandler):
+    """مسارات التطبيق: ثغرات مزروعة ومسارات سليمة للمقارنة وصفحات 404 ناعمة"""
+
+    server_version = 'BenchShop/1.0'
+    sys_version = ''
+
+    def log_message(self, format, *args):
+        pass
+
+    def route(self, method, path, params):
+        """إرجاع (الحالة، الترويسات الإضافية، الجسم) للمسار"""
+        value = lambda name, default='': params.get(name, [default])[0]
+
+        if path == '/':
+            return 200, {}, HOME
+        if path == '/search':
+            # q ينعكس دون ترميز، lang مرمّز
+            return 200, {}, (
+                f'<html>Results for {value("q")} in {html.escape(value("lang"))}'
+                '<form action="/search"><input name="q"></form></html>'
+            )
+        if path == '/safe':
+            return 200, {}, f'<html>safe {html.escape(value("x"))}</html>'
+        if path == '/profile':
+            # انعكاس داخل قيمة سمة دون ترميز
+            return 200, {}, (
+                '<html><form action="/profile" method="get">'
+                f'<input name="name" value="{value("name", "guest")}"></form></html>'
+            )
+        if path == '/comment':
+            if method == 'POST':
+                return 200, {}, (
+                    f'<html><p>{html.escape(value("author"))} wrote:</p>'
+                    f'<div>{value("body")}</div>{COMMENT_FORM}</html>'
+                )
+            return 200, {}, f'<html>{COMMENT_FORM}</html>'
+        if path == '/item':
+            item = value('id')
+            if "'" in item:
+                return 500, {}, (
+                    'You have an error in your SQL syntax; check the manual that '
+                    'corresponds to your MySQL server version for the right syntax'
+                )
+            return 200, {}, f'<html>item {html.escape(item)}</html>'
+        if path == '/orders':
+            return 200, {}, (
+                '<html><form action="/order" method="post"><input name="ref" value="A100">'
+                '<input type="submit" value="Track"></form></html>'
+            )
+        if path == '/order':
+            ref = value('ref')
+            if ref.count("'") % 2:
+                return 500, {}, f'ERROR:  syntax error at or near "{html.escape(ref)}"'
+            return 200, {}, f'<html>order {html.escape(ref)}: shipped</html>'
+        if path in ('/product', '/catalog'):
+            # مسارات سليمة: تعكس المدخلات مرمّزة ولا تُظهر أخطاء
+            return 200, {}, f'<html>{path[1:]} {html.escape(value("id") or value("page"))}</html>'
+        if path == '/large':
+            return 200, {}, self.server.large_page
+        if path == '/admin/':
+            return 200, {}, '<html><form action="/admin/login" method="post"><input name="user"></form></html>'
+        if path == '/.env':
+            return 200, {'Content-Type': 'text/plain'}, 'APP_KEY=base64:benchmark\nDB_PASSWORD=secret\n'
+        if path == '/backup/':
+            return 200, {}, '<html><h1>Index of /backup</h1><a href="db.sql.gz">db.sql.gz</a></html>'
+        if path == '/robots.txt':
+            return 200, {'Content-Type': 'text/plain'}, 'User-agent: *\nDisallow: /backup/\n'
+        if path == '/api/':
+            return 200, {'Content-Type': 'application/json'}, '{"status": "ok", "version": "v1"}'
+        if path.endswith('/') and path != '/':
+            # إعادة توجيه الشرطة المائلة الأخيرة: حالة مختلفة عن 404 الناعمة للملفات
+            return 301, {'Location': path.rstrip('/')}, ''
+        # صفحة 404 ناعمة: الحالة 200 مع المسار المطلوب في الجسم
+        return 200, {}, f'<html><h1>Oops</h1><p>Sorry, {html.escape(path)} was not found.</p></html>'
+
+    def respond(self, method, send_body=True):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+        if method == 'POST':
+            length = int(self.headers.get('Content-Length') or 0)
+            params.update(parse_qs(self.rfile.read(length).decode('utf-8', 'replace')))
+        status, headers, body = self.route(method, parsed.path, params)
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', headers.pop('Content-Type', 'text/html; charset=utf-8'))
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('X-Frame-Options', 'DENY')
+        self.send_header('X-Powered-By', 'PHP/7.4.3')
+        for name, header in headers.items():
+            self.send_header(name, header)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(data)
+
+    def do_GET(self):
+        self.respond('GET')
+
+    def do_POST(self):
+        self.respond('POST')
+
+    def do_HEAD(self):
+        self.respond('HEAD', send_body=False)
+
+def build_large_page(size_kb):
+    """صفحة كبيرة بروابط كثيرة لقياس سرعة التحليل والزحف"""
+    row = '<tr><td><a href="/product?id={i}">Product {i}</a></td><td>{i}.99</td></tr>\n'
+    parts = ['<html><body><table>']
+    length = 0
+    i = 0
+    while length < size_kb * 1024:
+        chunk = row.format(i=i)
+        parts.append(chunk)
+        length += len(chunk)
+        i += 1
+    parts.append('</table></body></html>')
+    return ''.join(parts)
+
+class TestApp:
+    """تطبيق ويب محلي ضعيف عمدًا يعمل في خيط خلفي للقياس"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, large_page_kb=256):
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.server.latency = latency
+        self.server.large_page = build_large_page(large_page_kb)
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.server.server_address[1]
+
+    @property
+    def url(self):
+        return f'http://{self.server.server_address[0]}:{self.port}/'
+
+    def ground_truth(self, scanner):
+        if scanner == 'ports':
+            return {self.port}
+        return set(GROUND_TRUTH[scanner])
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Local vulnerable web app for benchmarks')
+    parser.add_argument('--port', type=int, default=8000, help='Listen port')
+    parser.add_argument('--latency', type=float, default=0, help='Added latency per request in ms')
+    parser.add_argument('--large-page-kb', type=int, default=256, help='Size of the /large page')
+    args = parser.parse_args()
+
+    app = TestApp(port=args.port, latency=args.latency / 1000, large_page_kb=args.large_page_kb)
+    print(f'Serving on {app.url}')
+    try:
+        app.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -1,13 +1,44 @@
-from .vulnerability_scanner import VulnerabilityScanner
-from .port_scanner import PortScanner
-from .xss_scanner import XSSScanner
-from .sql_injection_scanner import SQLInjectionScanner
-from .directory_scanner import DirectoryScanner
-
-__all__ = [
-    'VulnerabilityScanner',
-    'PortScanner',
-    'XSSScanner',
-    'SQLInjectionScanner',
-    'DirectoryScanner'
-]
\ No newline at end of file
+import importlib
+
+# تحميل كسول: لا تُستورد وحدة الماسح واعتمادياتها الثقيلة إلا عند أول استخدام
+_EXPORTS = {
+    'VulnerabilityScanner': '.vulnerability_scanner',
+    'PortScanner': '.port_scanner',
+    'ConnectScanner': '.connect_scanner',
+    'XSSScanner': '.xss_scanner',
+    'SQLInjectionScanner': '.sql_injection_scanner',
+    'DirectoryScanner': '.directory_scanner',
+    'HTTPClient': '.http_client',
+    'ResponseCache': '.response_cache',
+    'ScanEngine': '.engine',
+    'Crawler': '.crawler',
+    'SiteMap': '.crawler',
+    'SignatureEngine': '.signatures',
+    'Fingerprint': '.fingerprint',
+    'BaselineStore': '.fingerprint',
+    'PayloadScheduler': '.scheduler',
+    'Wordlist': '.wordlist',
+    'RateLimiter': '.rate_limiter',
+    'Resolver': '.resolver',
+    'ScanOrchestrator': '.orchestrator',
+    'BatchRunner': '.batch',
+    'Metrics': '.metrics',
+    'ResultSink': '.sink',
+    'open_sink': '.sink',
+    'ScanState': '.state',
+    'SCANNERS': '.registry',
+    'load_scanner': '.registry'
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
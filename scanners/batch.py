@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from rich.console import Console
+from rich.progress import Progress
+from urllib.parse import urlparse
+import asyncio
+import io
+import json
+import multiprocessing
+import sys
+import threading
+import time
+
+from .orchestrator import ScanOrchestrator
+from .registry import SCANNERS
+from .resolver import Resolver
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def target_key(target):
+    """مفتاح موحد للهدف لإزالة التكرار: المخطط والمضيف والمنفذ والمسار"""
+    parsed = urlparse(target if '://' in target else f'//{target}')
+    host = (parsed.hostname or '').lower()
+    scheme = (parsed.scheme or 'http').lower()
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    port = port or DEFAULT_PORTS.get(scheme)
+    return scheme, host, port, parsed.path.rstrip('/')
+
+def load_targets(path):
+    """قراءة ملف النطاق المصرح به مع تجاهل التعليقات وإزالة التكرار"""
+    targets = []
+    seen = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            target = line.split('#', 1)[0].strip()
+            if not target:
+                continue
+            key = target_key(target)
+            if not key[1] or key in seen:
+                continue
+            seen.add(key)
+            targets.append(target)
+    return targets
+
+def process_context():
+    """سياق العمليات: خادم fork يستورد وحدات المسح مرة واحدة ثم تتفرع منه العمليات
+
+    العامل الناتج لا يعيد تشغيل المفسر ولا استيراد rich وbs4 وrequests.
+    حيث لا يتوفر forkserver (ويندوز) يُستخدم السياق الافتراضي.
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context()
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(
+        [f'{__package__}.orchestrator', f'{__package__}.http_client', f'{__package__}.crawler']
+        + [f'{__package__}{module}' for module, _ in SCANNERS.values()]
+    )
+    return context
+
+def scan_target(target, options):
+    """مسح هدف واحد بمنسق مستقل وإرجاع ملخص نتائجه
+
+    تُحجب مخرجات الماسحات النصية لأن النتائج تُكتب إلى ملف الدفعة.
+    """
+    started = time.monotonic()
+    try:
+        with redirect_stdout(io.StringIO()):
+            orchestrator = ScanOrchestrator(target, **options)
+            orchestrator.run()
+        result = orchestrator.summary()
+    except Exception as e:
+        result = {'target': target, 'error': str(e)}
+    result['elapsed'] = round(time.monotonic() - started, 3)
+    return result
+
+class BatchRunner:
+    """تشغيل المسح على عدة أهداف عبر مجمع عمليات أو مهام غير متزامنة
+
+    كل هدف يحصل على منسق وعميل HTTP ومحدد معدل خاص به، وتُكتب نتيجته
+    سطر JSON إلى ملف المخرجات فور اكتماله.
+    """
+
+    def __init__(self, targets, output, workers=4, mode='process', **options):
+        if mode not in ('process', 'async'):
+            raise ValueError(f'Unknown batch mode: {mode}')
+        self.targets = targets
+        self.output = output
+        self.workers = max(1, workers)
+        self.mode = mode
+        self.options = options
+        self.console = Console(file=sys.stdout)
+        self.completed = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._file = None
+
+    def write(self, result):
+        """كتابة نتيجة هدف واحد إلى ملف المخرجات مباشرة"""
+        with self._lock:
+            self._file.write(json.dumps(result, ensure_ascii=False, default=str) + '\n')
+            self._file.flush()
+            self.completed += 1
+            if result.get('error'):
+                self.failed += 1
+
+    def run_processes(self, progress, task):
+        """توزيع الأهداف على عمليات عاملة دائمة
+
+        العزل بين الأهداف بمنسق مستقل لكل هدف لا بإعادة إنشاء العملية،
+        فلا يدفع كل هدف كلفة بدء عملية جديدة.
+        """
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=process_context()) as executor:
+            futures = {
+                executor.submit(scan_target, target, self.options): target
+                for target in self.targets
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'target': futures[future], 'error': str(e)}
+                self.write(result)
+                progress.update(task, advance=1)
+
+    async def run_async(self, progress, task):
+        """تشغيل الأهداف كمهام متزامنة في حلقة أحداث واحدة"""
+        limit = asyncio.Semaphore(self.workers)
+        # الأهداف في الحلقة نفسها تتشارك ذاكرة DNS: المضيف المتكرر يُحل مرة
+        resolver = Resolver()
+
+        async def scan(target):
+            async with limit:
+                started = time.monotonic()
+                orchestrator = None
+                try:
+                    orchestrator = ScanOrchestrator(target, resolver=resolver, **self.options)
+                    orchestrator.progress = progress
+                    await orchestrator.run_async()
+                    result = orchestrator.summary()
+                except Exception as e:
+                    result = {'target': target, 'error': str(e)}
+                finally:
+                    if orchestrator is not None:
+                        orchestrator.close()
+                result['elapsed'] = round(time.monotonic() - started, 3)
+                self.write(result)
+                progress.update(task, advance=1)
+
+        await asyncio.gather(*(scan(target) for target in self.targets))
+
+    def run(self):
+        """تشغيل الدفعة كاملة وإرجاع عدد الأهداف المكتملة"""
+        with open(self.output, 'a', encoding='utf-8') as f, Progress(console=self.console) as progress:
+            self._file = f
+            task = progress.add_task('[cyan]Scanning targets...', total=len(self.targets))
+            try:
+                if self.mode == 'process':
+                    self.run_processes(progress, task)
+                else:
+                    asyncio.run(self.run_async(progress, task))
+            except KeyboardInterrupt:
+                self.console.print('[yellow]Batch interrupted by user.[/yellow]')
+            finally:
+                self._file = None
+        return self.completed
+
+    def generate_report(self):
+        """طباعة ملخص الدفعة"""
+        self.console.print('\n[bold green]===== Batch Scan Summary =====[/bold green]')
+        self.console.print(f'Targets: {len(self.targets)}')
+        self.console.print(f'Completed: {self.completed}')
+        if self.failed:
+            self.console.print(f'[red]Failed: {self.failed}[/red]')
+        self.console.print(f'Results written to {self.output}')
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+
+import asyncio
+import errno
+import socket
+import time
+
+# توقيعات بدايات الاستجابات لتحديد الخدمة دون nmap
+BANNER_SIGNATURES = [
+    (b'SSH-', 'ssh'),
+    (b'HTTP/', 'http'),
+    (b'+OK', 'pop3'),
+    (b'* OK', 'imap'),
+    (b'RFB ', 'vnc'),
+    (b'\x15\x03', 'ssl'),
+    (b'\x16\x03', 'ssl')
+]
+HTTP_PROBE = b'HEAD / HTTP/1.0\r\n\r\n'
+# منافذ HTTP المعتادة: يُرسل الطلب مباشرة بدل انتظار ترحيب لن يأتي
+HTTP_PROBE_PORTS = {80, 81, 591, 3000, 5000, 8000, 8008, 8080, 8081, 8888}
+
+def parse_ports(spec):
+    """تحويل مواصفة المنافذ مثل '1-1000,8080' إلى قائمة مرتبة"""
+    ports = set()
+    for part in str(spec).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-', 1)
+            ports.update(range(int(start), int(end) + 1))
+        else:
+            ports.add(int(part))
+    invalid = [port for port in ports if not 0 < port < 65536]
+    if invalid:
+        raise ValueError(f'Invalid port number: {invalid[0]}')
+    return sorted(ports)
+
+def service_name(port):
+    """اسم الخدمة المسجل للمنفذ إن وجد"""
+    try:
+        return socket.getservbyport(port, 'tcp')
+    except OSError:
+        return ''
+
+def identify_service(port, banner):
+    """تحديد الخدمة وإصدارها من أول ما يرسله المنفذ"""
+    if not banner:
+        return service_name(port), ''
+    first_line = banner.split(b'\r\n', 1)[0].split(b'\n', 1)[0]
+    version = first_line.decode('latin-1', 'replace').strip()[:100]
+    for prefix, service in BANNER_SIGNATURES:
+        if banner.startswith(prefix):
+            if service == 'http':
+                # الإصدار من ترويسة Server بدل سطر الحالة
+                for line in banner.decode('latin-1', 'replace').splitlines()[1:]:
+                    name, _, value = line.partition(':')
+                    if name.strip().lower() == 'server':
+                        return 'http', value.strip()[:100]
+                return 'http', ''
+            if service == 'ssl':
+                return 'ssl', ''
+            return service, version
+    if banner.startswith(b'220'):
+        upper = banner.upper()
+        return ('smtp' if b'SMTP' in upper else 'ftp'), version
+    return service_name(port), version
+
+async def grab_banner(host, port, timeout=2.0, max_bytes=1024):
+    """قراءة ترحيب الخدمة، وإرسال طلب HTTP إن بقيت صامتة"""
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return b''
+    try:
+        if port not in HTTP_PROBE_PORTS:
+            try:
+                banner = await asyncio.wait_for(reader.read(max_bytes), timeout)
+                if banner:
+                    return banner
+            except asyncio.TimeoutError:
+                pass
+        writer.write(HTTP_PROBE)
+        await writer.drain()
+        return await asyncio.wait_for(reader.read(max_bytes), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return b''
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+class RTTEstimator:
+    """تقدير زمن الذهاب والإياب ومهلة الاتصال على طريقة TCP (RFC 6298)"""
+
+    def __init__(self, initial_timeout=1.0, min_timeout=0.1, max_timeout=3.0):
+        self.initial_timeout = initial_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.srtt = None
+        self.rttvar = None
+
+    def add(self, rtt):
+        """إضافة عينة زمن من اتصال اكتمل أو رُفض"""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+
+    @property
+    def timeout(self):
+        if self.srtt is None:
+            return self.initial_timeout
+        return min(self.max_timeout, max(self.min_timeout, self.srtt + 4 * self.rttvar))
+
+class ConnectScanner:
+    """ماسح منافذ TCP connect غير متزامن لا يحتاج صلاحيات الجذر
+
+    عدد محدود من العمال يسحب المنافذ من مولّد مشترك، فيبقى استهلاك الذاكرة
+    ثابتًا مهما كان نطاق المنافذ. المهلة تتكيف مع زمن الاستجابة المقاس، والمنفذ
+    الذي لا يرد يُعاد فحصه بمهلة مضاعفة قبل اعتباره مفلترًا.
+    """
+
+    def __init__(self, host, ports, concurrency=500, retries=1, rtt=None):
+        self.host = host
+        self.ports = ports
+        self.concurrency = concurrency
+        self.retries = retries
+        self.rtt = rtt if rtt else RTTEstimator()
+
+    async def probe(self, port):
+        """فحص منفذ واحد وإرجاع حالته: open أو closed أو filtered"""
+        timeout = self.rtt.timeout
+        for _ in range(self.retries + 1):
+            started = time.monotonic()
+            try:
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, port), timeout
+                )
+            except asyncio.TimeoutError:
+                timeout = min(timeout * 2, self.rtt.max_timeout)
+                continue
+            except ConnectionRefusedError:
+                self.rtt.add(time.monotonic() - started)
+                return 'closed'
+            except OSError as e:
+                if e.errno in (errno.EMFILE, errno.ENFILE):
+                    # نفاد واصفات الملفات: انتظار تحرر اتصالات أخرى ثم المحاولة
+                    await asyncio.sleep(0.1)
+                    continue
+                return 'filtered'
+            self.rtt.add(time.monotonic() - started)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+            return 'open'
+        return 'filtered'
+
+    async def scan(self, on_result):
+        """فحص جميع المنافذ واستدعاء on_result(port, state) فور معرفة كل نتيجة"""
+        ports = iter(self.ports)
+
+        async def worker():
+            for port in ports:
+                state = await self.probe(port)
+                await on_result(port, state)
+
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(self.ports)))))
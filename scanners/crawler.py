@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+
+from rich.console import Console
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl
+from urllib.robotparser import RobotFileParser
+from collections import OrderedDict
+import re
+import threading
+
+from .engine import ScanEngine, host_of
+from .fingerprint import content_hash
+from .html_parser import extract_links_and_forms
+from .http_client import HTTPClient, DEFAULT_USER_AGENT
+from .state import NullState
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+# مقاطع المسار المتغيرة التي تُستبدل بقوالب: أرقام ومعرفات UUID وبصمات ست عشرية
+SEGMENT_TEMPLATES = [
+    (re.compile(r'^\d+$'), '{int}'),
+    (re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.I), '{uuid}'),
+    (re.compile(r'^[0-9a-f]{16,}$', re.I), '{hex}')
+]
+
+def normalize_url(url):
+    """تطبيع عنوان URL لإزالة التكرار في قائمة الزحف"""
+    if not url.startswith(('http://', 'https://')):
+        url = f'http://{url}'
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or '').lower()
+    if parsed.port and parsed.port != DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{parsed.port}'
+    path = parsed.path or '/'
+    # ترتيب المعاملات حسب الاسم (ترتيب مستقر يحفظ تكرار الاسم الواحد)
+    query = '&'.join(sorted(
+        (part for part in parsed.query.split('&') if part), key=lambda part: part.split('=', 1)[0]
+    ))
+    return urlunparse((scheme, host, path, parsed.params, query, ''))
+
+def path_template(path):
+    """استبدال مقاطع المسار المتغيرة بقوالبها: /item/42 ← /item/{int}"""
+    segments = []
+    for segment in path.split('/'):
+        for pattern, template in SEGMENT_TEMPLATES:
+            if pattern.match(segment):
+                segment = template
+                break
+        segments.append(segment)
+    return '/'.join(segments)
+
+def url_template(url):
+    """قالب المسار: المسار بقوالب مقاطعه وأسماء المعاملات المرتبة دون قيمها
+
+    العناوين التي تشترك في القالب نفسه (/item?id=1 و/item?id=2) تُعامل كمسار واحد.
+    """
+    parsed = urlparse(normalize_url(url))
+    names = sorted({name for name, _ in parse_qsl(parsed.query, keep_blank_values=True)})
+    return urlunparse((parsed.scheme, parsed.netloc, path_template(parsed.path), '', '&'.join(names), ''))
+
+def strip_query(url):
+    """إزالة سلسلة الاستعلام من عنوان URL"""
+    parsed = urlparse(url)
+    return urlunparse((parsed.scheme, parsed.netloc, parsed.path, parsed.params, '', ''))
+
+def endpoint_signature(endpoint, inputs):
+    """التوقيع القانوني لنقطة حقن: الطريقة والعنوان المحلول والحقول
+
+    نماذج GET تستبدل سلسلة الاستعلام في عنوان الإرسال، لذلك تُحذف منه،
+    ويُستخدم قالب المسار فيُختبر /user/1/edit و/user/2/edit مرة واحدة.
+    """
+    method = endpoint['method'].lower()
+    url = strip_query(endpoint['url']) if method == 'get' else endpoint['url']
+    return method, url_template(url), tuple(sorted(inputs))
+
+class SiteMap:
+    """خريطة الموقع: الصفحات ونقاط الحقن الفريدة (النماذج ومعاملات الاستعلام)
+
+    النموذج المكرر في عدة صفحات (بحث، تسجيل دخول، نشرة بريدية) يُسجل مرة
+    واحدة في forms، مع قائمة الصفحات التي يظهر فيها في المفتاح pages.
+    """
+
+    def __init__(self):
+        self.pages = OrderedDict()
+        self.forms = []
+        self.parameters = []
+        self.endpoints = OrderedDict()
+        self.duplicates = 0
+        self._lock = threading.Lock()
+
+    def add_page(self, url, depth, status, links, forms, changed=True):
+        """تسجيل صفحة تم جلبها مع محتوياتها"""
+        query = parse_qsl(urlparse(url).query, keep_blank_values=True)
+        self.pages[url] = {
+            'depth': depth,
+            'status': status,
+            'links': links,
+            'forms': forms,
+            'params': dict(query),
+            'changed': changed
+        }
+        for form in forms:
+            inputs = ((field['name'], field.get('type') or 'text') for field in form['inputs'])
+            self._add_endpoint(('form',) + endpoint_signature(form, inputs), form, url, self.forms)
+        if query:
+            entry = {
+                'page': url,
+                'url': strip_query(url),
+                'method': 'get',
+                'params': dict(query)
+            }
+            signature = ('query',) + endpoint_signature(entry, entry['params'])
+            self._add_endpoint(signature, entry, url, self.parameters)
+
+    def _add_endpoint(self, signature, endpoint, page, targets):
+        """تسجيل نقطة الحقن مرة واحدة وإضافة الصفحة إلى الصفحات المشتركة فيها"""
+        with self._lock:
+            known = self.endpoints.get(signature)
+            if known is None:
+                known = self.endpoints[signature] = dict(endpoint, pages=[page])
+                targets.append(known)
+            elif page not in known['pages']:
+                known['pages'].append(page)
+                self.duplicates += 1
+
+    def changed(self):
+        """خريطة فرعية بالصفحات التي تغير محتواها أو نماذجها منذ المسح السابق"""
+        site_map = SiteMap()
+        for url, page in self.pages.items():
+            if page['changed']:
+                site_map.add_page(url, page['depth'], page['status'], page['links'], page['forms'])
+        return site_map
+
+    def unchanged_urls(self):
+        """عناوين الصفحات ونقاط الحقن التي لا تظهر إلا في صفحات لم تتغير"""
+        changed, unchanged = set(), set()
+        for url, page in self.pages.items():
+            urls = changed if page['changed'] else unchanged
+            urls.update((url, strip_query(url)))
+            urls.update(form['url'] for form in page['forms'])
+        return unchanged - changed
+
+    def __len__(self):
+        return len(self.pages)
+
+class Crawler:
+    """زاحف مشترك يبني خريطة الموقع مرة واحدة لجميع الماسحات"""
+
+    def __init__(self, target, client=None, engine=None, max_pages=500,
+                 max_depth=3, max_links_per_page=100, respect_robots=True, scope=None,
+                 parser_backend=None, state=None, incremental=False, max_per_template=3):
+        self.target = normalize_url(target)
+        self.console = Console()
+        self.client = client if client else HTTPClient()
+        self.engine = engine if engine else ScanEngine()
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.max_links_per_page = max_links_per_page
+        # الصفحات الأكبر تُحلل حتى هذا الحد فقط
+        self.max_page_size = 5 * 1024 * 1024
+        self.respect_robots = respect_robots
+        self.parser_backend = parser_backend
+        # النطاق المسموح: مضيف الهدف افتراضيًا
+        self.scope = set(scope) if scope else {urlparse(self.target).netloc}
+        self.robots = None
+        self.seen = set()
+        # عدد الصفحات المجلوبة لكل قالب مسار: صفحات الكتالوج المتشابهة لا تستهلك الميزانية
+        self.max_per_template = max_per_template
+        self.templates = {}
+        self.collapsed = 0
+        self.site_map = SiteMap()
+        self.state = state if state else NullState()
+        # المسح التزايدي: طلبات شرطية ومقارنة البصمات مع آخر مسح مكتمل
+        self.incremental = incremental
+        self.index = {}
+        self.unchanged = 0
+
+    def in_scope(self, url):
+        """التحقق من أن العنوان ضمن نطاق الزحف"""
+        parsed = urlparse(url)
+        return parsed.scheme in DEFAULT_PORTS and parsed.netloc in self.scope
+
+    def load_robots(self):
+        """تحميل ملف robots.txt للهدف"""
+        self.robots = RobotFileParser()
+        try:
+            # الحد الذي تعتمده محركات البحث لحجم robots.txt
+            response = self.client.get(urljoin(self.target, '/robots.txt'), max_bytes=500 * 1024)
+            if response.status_code == 200:
+                self.robots.parse(response.text.splitlines())
+            else:
+                self.robots.allow_all = True
+        except Exception:
+            self.robots.allow_all = True
+
+    def allowed(self, url):
+        """التحقق من سماح robots.txt بزيارة العنوان"""
+        if not self.respect_robots or self.robots is None:
+            return True
+        return self.robots.can_fetch(DEFAULT_USER_AGENT, url)
+
+    def parse_forms(self, raw_forms, page_url):
+        """تحويل النماذج المستخرجة إلى نقاط حقن بعناوين مطلقة"""
+        forms = []
+        for form in raw_forms:
+            forms.append({
+                'page': page_url,
+                'action': form['action'],
+                'url': normalize_url(urljoin(page_url, form['action'])),
+                'method': form['method'],
+                'inputs': form['inputs']
+            })
+        return forms
+
+    def parse_links(self, hrefs, page_url):
+        """استخراج الروابط الفريدة ضمن النطاق"""
+        links = []
+        for href in hrefs:
+            if not href.startswith(('#', 'javascript:', 'mailto:')):
+                absolute_url = normalize_url(urljoin(page_url, href))
+                if self.in_scope(absolute_url) and absolute_url not in links:
+                    links.append(absolute_url)
+                    if len(links) >= self.max_links_per_page:
+                        break
+        return links
+
+    @staticmethod
+    def inventory_hash(forms):
+        """بصمة نقاط الحقن في الصفحة: عناوين النماذج وطرقها وأسماء حقولها"""
+        inventory = sorted(
+            (form['method'], form['url'], sorted(field['name'] for field in form['inputs']))
+            for form in forms
+        )
+        return content_hash(repr(inventory))
+
+    def conditional_headers(self, record):
+        """رؤوس الطلب الشرطي من مصادقات المسح السابق"""
+        headers = {}
+        if record and record['etag']:
+            headers['If-None-Match'] = record['etag']
+        if record and record['last_modified']:
+            headers['If-Modified-Since'] = record['last_modified']
+        return headers
+
+    def fetch_page(self, url, depth):
+        """جلب صفحة واحدة وتحليلها"""
+        try:
+            previous = self.index.get(url)
+            response = self.client.get(
+                url, headers=self.conditional_headers(previous), max_bytes=self.max_page_size
+            )
+            if response.status_code == 304 and previous:
+                # لم تتغير الصفحة: إعادة استخدام روابطها ونماذجها دون تنزيلها
+                record = dict(previous)
+                page = record['page']
+                status, links, forms = page['status'], page['links'], page['forms']
+            else:
+                extracted = extract_links_and_forms(response.text, self.parser_backend)
+                links = self.parse_links(extracted['links'], url)
+                forms = self.parse_forms(extracted['forms'], url)
+                status = response.status_code
+                record = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'body_hash': content_hash(response.text),
+                    'inventory_hash': self.inventory_hash(forms),
+                    'page': {'status': status, 'links': links, 'forms': forms}
+                }
+
+            changed = not (
+                previous
+                and record['body_hash'] == previous['body_hash']
+                and record['inventory_hash'] == previous['inventory_hash']
+            )
+            if not changed:
+                self.unchanged += 1
+            self.site_map.add_page(url, depth, status, links, forms, changed)
+            self.state.save_page(self.target, url, record)
+            self.state.complete_page(self.target, url, depth, {
+                'status': status, 'links': links, 'forms': forms, 'changed': changed
+            })
+            return links
+        except Exception as e:
+            self.console.print(f'[red]Error crawling {url}: {str(e)}[/red]')
+            return []
+
+    def _claim(self, url):
+        """حجز عنوان في قائمة الزحف إن لم يُزر بعد"""
+        if url in self.seen or len(self.seen) >= self.max_pages:
+            return False
+        template = url_template(url)
+        if self.templates.get(template, 0) >= self.max_per_template:
+            self.collapsed += 1
+            return False
+        if not self.allowed(url):
+            return False
+        self.seen.add(url)
+        self.templates[template] = self.templates.get(template, 0) + 1
+        return True
+
+    def restore(self):
+        """استعادة خريطة الموقع وقائمة الزحف المنتظرة من حالة مسح سابق"""
+        done, pending = self.state.frontier(self.target)
+        for url, depth, page in done:
+            self.seen.add(url)
+            self.site_map.add_page(
+                url, depth, page['status'], page['links'], page['forms'], page.get('changed', True)
+            )
+        for url, _ in pending:
+            self.seen.add(url)
+        for url in self.seen:
+            template = url_template(url)
+            self.templates[template] = self.templates.get(template, 0) + 1
+
+        if pending:
+            return [url for url, _ in pending], pending[0][1]
+        if not done:
+            return [], 0
+        # اكتملت آخر طبقة قبل حجز التالية: حجزها من روابط الطبقة الأعمق
+        depth = max(depth for _, depth, _ in done) + 1
+        if depth > self.max_depth:
+            return [], depth
+        frontier = [
+            link for _, page_depth, page in done if page_depth == depth - 1
+            for link in page['links'] if self._claim(link)
+        ]
+        self.state.add_frontier(self.target, frontier, depth)
+        return frontier, depth
+
+    async def crawl_async(self):
+        """زحف الموقع طبقة بعد طبقة مع جلب الصفحات بالتوازي"""
+        if self.respect_robots and self.robots is None:
+            await self.engine.submit(host_of(self.target), self.load_robots)
+
+        if self.incremental:
+            self.index = self.state.page_index(self.target)
+        frontier, depth = self.restore()
+        if not self.seen and self._claim(self.target):
+            frontier = [self.target]
+            self.state.add_frontier(self.target, frontier, depth)
+        while frontier:
+            results = await self.engine.gather(
+                self.engine.submit(host_of(url), self.fetch_page, url, depth)
+                for url in frontier
+            )
+            depth += 1
+            if depth > self.max_depth:
+                break
+            frontier = [
+                link for links in results for link in links
+                if self._claim(link)
+            ]
+            self.state.add_frontier(self.target, frontier, depth)
+
+        return self.site_map
+
+    def crawl(self):
+        """غلاف متزامن لعملية الزحف"""
+        return self.engine.run(self.crawl_async())
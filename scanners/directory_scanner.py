@@ -2,19 +2,38 @@
 
 import requests
 from rich.console import Console
-from rich.progress import Progress
 from urllib.parse import urljoin
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import secrets
+import threading
+
+from .engine import ScanEngine, host_of, progress_bar
+from .fingerprint import Baseline, Fingerprint
+from .http_client import HTTPClient, content_length
+from .rate_limiter import RateLimiter
+from .wordlist import OffsetTracker, Wordlist
+from .sink import NullSink
+from .state import NullState
 
 class DirectoryScanner:
-    def __init__(self, target, wordlist=None):
+    def __init__(self, target, wordlist=None, client=None, engine=None, extensions=None,
+                 requests_per_second=50, sink=None, state=None):
         self.target = target
         self.console = Console()
         self.findings = []
         self.headers = {
             'User-Agent': 'Web-Hack Security Scanner v1.0 (SayerLinux)'
         }
+        # معدل الطلبات يُضبط بالطلبات في الثانية عبر محدد المعدل لا بعدد الخيوط
+        self.client = client if client else HTTPClient(
+            headers=self.headers,
+            rate_limiter=RateLimiter(per_host=requests_per_second)
+        )
+        self.engine = engine if engine else ScanEngine()
+        # شريط تقدم مشترك يمرره المنسق عند تشغيل عدة ماسحات معًا
+        self.progress = None
+        self.sink = sink if sink else NullSink()
+        self.state = state if state else NullState()
         # قائمة المسارات الشائعة للفحص
         self.default_paths = [
             # مسارات إدارة
@@ -50,9 +69,30 @@ class DirectoryScanner:
             'composer.json', 'package.json', 'yarn.lock',
             'Gemfile', 'requirements.txt'
         ]
+        # قائمة مسارات أو مسار ملف يُقرأ بشكل متدفق
         self.wordlist = wordlist if wordlist else self.default_paths
+        self.extensions = extensions or []
+        self.paths_scanned = 0
+        self.progress_offset = 0
+        # إيقاف تعاوني: يُفحص بين الطلبات لأن المسح يعمل في خيط لا يمكن إلغاؤه
+        self.stop_event = threading.Event()
         self.max_threads = 10
-        self.request_delay = 0.1  # تأخير بين الطلبات
+        self.found_statuses = [200, 201, 203]
+        self.redirect_statuses = [301, 302, 307, 308]
+        # مسارات عشوائية لمعايرة صفحات 404 الناعمة
+        self.calibration_paths = ['{}', '{}/', '{}.php']
+        self.body_sample_size = 16384
+        self.soft_404 = []
+        # خط أساس لكل رمز حالة: عينات الحالات المختلفة لا تُقارن ببعضها
+        self.soft_404_baselines = {}
+        self.use_head = False
+
+    def add_finding(self, finding):
+        """تسجيل مسار مكتشف وإرساله إلى مخرج النتائج"""
+        if not self.state.add_finding('directory', self.target, finding):
+            return
+        self.findings.append(finding)
+        self.sink.emit(finding, scanner='directory', target=self.target)
 
     def normalize_url(self, url):
         """تطبيع عنوان URL"""
@@ -62,37 +102,124 @@ class DirectoryScanner:
             url += '/'
         return url
 
+    def fetch_prefix(self, url):
+        """جلب أول جزء من الجسم فقط باستخدام طلب Range وقراءة محدودة الحجم"""
+        response = self.client.get(
+            url,
+            headers={'Range': f'bytes=0-{self.body_sample_size - 1}'},
+            allow_redirects=False,
+            max_bytes=self.body_sample_size,
+            timeout=5
+        )
+        # الحالتان 206 و416 تعنيان وجود المورد: تحويلهما إلى 200
+        status_code = 200 if response.status_code in (206, 416) else response.status_code
+        return response, status_code, response.content.decode(response.encoding or 'utf-8', 'replace')
+
+    def _signature(self, path, status_code, text, location):
+        """بناء توقيع الاستجابة مع تحييد اسم المسار المنعكس"""
+        reflected = ((path.strip('/'), 'PATH'),)
+        return {
+            'status_code': status_code,
+            'fingerprint': Fingerprint(status_code, text, reflected),
+            'location': location.replace(path.strip('/'), 'PATH') if location else ''
+        }
+
+    def calibrate(self, base_url):
+        """تعلم توقيع صفحات 404 الناعمة من مسارات عشوائية غير موجودة"""
+        self.soft_404 = []
+        head_statuses = []
+        for template in self.calibration_paths:
+            path = template.format(secrets.token_hex(6))
+            url = urljoin(base_url, path)
+            try:
+                response, status_code, text = self.fetch_prefix(url)
+                self.soft_404.append(self._signature(
+                    path, status_code, text, response.headers.get('location', '')
+                ))
+                head = self.client.head(url, allow_redirects=False, timeout=5)
+                head_statuses.append(head.status_code == status_code)
+            except requests.exceptions.RequestException:
+                head_statuses.append(False)
+
+        # يُعتمد HEAD فقط إذا طابقت حالته حالة GET لكل العينات
+        self.use_head = bool(head_statuses) and all(head_statuses)
+        catch_all = {}
+        for sig in self.soft_404:
+            if sig['status_code'] in self.found_statuses + self.redirect_statuses:
+                catch_all.setdefault(sig['status_code'], []).append(sig['fingerprint'])
+        self.soft_404_baselines = {
+            status_code: Baseline(fingerprints) for status_code, fingerprints in catch_all.items()
+        }
+        return self.soft_404
+
+    def _is_soft_404(self, signature):
+        """التحقق من مطابقة الاستجابة لتوقيع صفحة 404 الناعمة"""
+        baseline = self.soft_404_baselines.get(signature['status_code'])
+        for known in self.soft_404:
+            if known['status_code'] != signature['status_code']:
+                continue
+            if signature['status_code'] in self.redirect_statuses:
+                if known['location'] == signature['location']:
+                    return True
+            elif baseline and not baseline.differs(signature['fingerprint']):
+                return True
+        return False
+
+    def _needs_body(self, status_code):
+        """هل يلزم جلب الجسم لتمييز هذه الحالة عن 404 الناعمة؟"""
+        return any(
+            known['status_code'] == status_code and status_code in self.found_statuses
+            for known in self.soft_404
+        )
+
+    def stop(self):
+        """طلب إيقاف المسح: لا تُرسل طلبات جديدة وتُستكمل الجارية فقط"""
+        self.stop_event.set()
+
     def check_path(self, base_url, path):
         """فحص مسار واحد"""
+        if self.stop_event.is_set():
+            return
         url = urljoin(base_url, path)
         try:
-            response = requests.get(
-                url,
-                headers=self.headers,
-                allow_redirects=False,
-                timeout=5
-            )
-            
+            response = None
+            text = ''
+            if self.use_head:
+                response = self.client.head(url, allow_redirects=False, timeout=5)
+                status_code = response.status_code
+                if status_code not in self.found_statuses + self.redirect_statuses:
+                    return
+                if self._needs_body(status_code):
+                    response = None
+
+            if response is None:
+                response, status_code, text = self.fetch_prefix(url)
+                if status_code not in self.found_statuses + self.redirect_statuses:
+                    return
+
+            location = response.headers.get('location', '')
+            if self._is_soft_404(self._signature(path, status_code, text, location)):
+                return
+
             # التحقق من الاستجابة
-            if response.status_code in [200, 201, 203]:
-                self.findings.append({
+            if status_code in self.found_statuses:
+                # الحجم الكامل من الترويسات لا من الجزء المقروء
+                length = content_length(response)
+                self.add_finding({
                     'url': url,
-                    'status_code': response.status_code,
-                    'content_length': len(response.content),
+                    'status_code': status_code,
+                    'content_length': length if length is not None else len(text),
                     'content_type': response.headers.get('content-type', ''),
                     'risk_level': 'HIGH' if self._is_sensitive_path(path) else 'MEDIUM'
                 })
-            elif response.status_code in [301, 302, 307, 308]:
-                redirect_url = response.headers.get('location', '')
-                self.findings.append({
+            elif status_code in self.redirect_statuses:
+                self.add_finding({
                     'url': url,
-                    'status_code': response.status_code,
-                    'redirect_to': redirect_url,
+                    'status_code': status_code,
+                    'redirect_to': location,
                     'risk_level': 'LOW'
                 })
 
-            time.sleep(self.request_delay)  # تأخير بين الطلبات
-
         except requests.exceptions.RequestException:
             pass
 
@@ -105,33 +232,73 @@ class DirectoryScanner:
         ]
         return any(keyword in path.lower() for keyword in sensitive_keywords)
 
-    def scan(self):
+    def scan(self, start_offset=0):
         """تنفيذ المسح الكامل"""
         base_url = self.normalize_url(self.target)
-        total_paths = len(self.wordlist)
-        
-        with Progress() as progress:
+        # استئناف المسح من آخر إزاحة محفوظة في حالة المسح
+        state_key = f'directory:{base_url}'
+        start_offset = start_offset or self.state.get_offset(state_key)
+        self.calibrate(base_url)
+
+        wordlist = Wordlist(self.wordlist, self.extensions, start_offset)
+        tracker = OffsetTracker(start_offset)
+        self.progress_offset = start_offset
+        max_in_flight = self.max_threads * 2
+
+        with progress_bar(self.progress) as progress:
             task = progress.add_task(
                 '[cyan]Scanning directories...',
-                total=total_paths
+                total=wordlist.size(),
+                completed=start_offset
             )
-            
+
+            def finish(future):
+                offset = in_flight.pop(future)
+                if self.stop_event.is_set():
+                    # المسارات التي لم تُفحص لا تُحسب في إزاحة الاستئناف
+                    return
+                self.paths_scanned += 1
+                completed = tracker.done(offset)
+                if completed != self.progress_offset:
+                    self.progress_offset = completed
+                    self.state.set_offset(state_key, completed)
+                progress.update(task, completed=self.progress_offset)
+
+            # نافذة محدودة من الطلبات الجارية بدل مستقبل لكل مسار
             with ThreadPoolExecutor(max_workers=self.max_threads) as executor:
-                future_to_path = {}
-                for path in self.wordlist:
-                    future = executor.submit(self.check_path, base_url, path)
-                    future_to_path[future] = path
+                in_flight = {}
+                for offset, paths in wordlist.groups():
+                    if self.stop_event.is_set():
+                        break
+                    tracker.add(offset, len(paths))
+                    for path in paths:
+                        if self.stop_event.is_set():
+                            break
+                        while len(in_flight) >= max_in_flight:
+                            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                finish(future)
+                        future = executor.submit(self.check_path, base_url, path)
+                        in_flight[future] = offset
 
-                for future in as_completed(future_to_path):
-                    progress.update(task, advance=1)
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finish(future)
 
         return self.findings
 
+    async def scan_async(self):
+        """تنفيذ المسح الكامل بشكل غير متزامن"""
+        return await self.engine.submit(host_of(self.normalize_url(self.target)), self.scan)
+
     def generate_report(self):
         """إنشاء تقرير بنتائج المسح"""
         self.console.print('\n[bold green]===== Directory Scan Report =====[/bold green]')
         self.console.print(f'Target: {self.target}')
-        self.console.print(f'Total paths scanned: {len(self.wordlist)}\n')
+        self.console.print(f'Total paths scanned: {self.paths_scanned}\n')
+        if self.soft_404_baselines:
+            self.console.print('[yellow]Catch-all responses detected: soft-404 matches were filtered.[/yellow]\n')
 
         if not self.findings:
             self.console.print('[green]No sensitive directories or files found![/green]')
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from rich.progress import Progress
+from urllib.parse import urlparse
+import asyncio
+import functools
+import sys
+
+def host_of(url):
+    """استخراج المضيف من عنوان URL لاستخدامه كمفتاح للتوازي"""
+    return urlparse(url).netloc or url
+
+def progress_bar(progress=None):
+    """استخدام شريط التقدم المشترك إن مُرر، وإلا إنشاء شريط مستقل"""
+    return nullcontext(progress) if progress is not None else Progress()
+
+class ScanEngine:
+    """محرك تنفيذ غير متزامن مع حد عام للتوازي وحد لكل مضيف"""
+
+    def __init__(self, max_concurrency=20, per_host_concurrency=5):
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self._executor = None
+        self._global_limit = None
+        self._host_limits = {}
+
+    def _start(self):
+        """تهيئة الحدود داخل حلقة الأحداث الحالية"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        if self._global_limit is None:
+            self._global_limit = asyncio.Semaphore(self.max_concurrency)
+
+    def _host_limit(self, host):
+        """جلب حد التوازي الخاص بالمضيف"""
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = asyncio.Semaphore(self.per_host_concurrency)
+            self._host_limits[host] = limit
+        return limit
+
+    async def submit(self, host, func, *args, **kwargs):
+        """تنفيذ دالة فحص متزامنة ضمن حدود التوازي"""
+        self._start()
+        loop = asyncio.get_running_loop()
+        async with self._global_limit:
+            async with self._host_limit(host):
+                return await loop.run_in_executor(
+                    self._executor, functools.partial(func, *args, **kwargs)
+                )
+
+    async def gather(self, coroutines):
+        """تنفيذ مجموعة من المهام المستقلة بالتوازي"""
+        return await asyncio.gather(*coroutines)
+
+    def run(self, coroutine):
+        """غلاف متزامن لتشغيل مسح غير متزامن حتى اكتماله"""
+        try:
+            result = asyncio.run(coroutine)
+        except BaseException:
+            # عند الإلغاء أو الخطأ: إسقاط المهام المنتظرة دون انتظار الجارية
+            self.shutdown(wait=False)
+            raise
+        self.shutdown()
+        return result
+
+    def shutdown(self, wait=True):
+        """إيقاف مجمع الخيوط وإعادة ضبط الحدود"""
+        if self._executor is not None:
+            if wait or sys.version_info < (3, 9):
+                self._executor.shutdown(wait=wait)
+            else:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._global_limit = None
+        self._host_limits = {}
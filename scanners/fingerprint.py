@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+import hashlib
+import html
+import re
+import threading
+
+# مناطق متغيرة بين الطلبات: رموز CSRF والطوابع الزمنية والمعرفات العشوائية
+VOLATILE_PATTERNS = [
+    re.compile(r'(<input[^>]*type=["\']?hidden["\']?[^>]*value=)(["\'])[^"\']*\2', re.I),
+    re.compile(r'(<meta[^>]*name=["\'][^"\']*(?:csrf|token|nonce)[^"\']*["\'][^>]*content=)(["\'])[^"\']*\2', re.I),
+    re.compile(r'(nonce=)(["\'])[^"\']*\2', re.I),
+    re.compile(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?'),
+    re.compile(r'\b\d{1,2}:\d{2}(?::\d{2})?\b'),
+    re.compile(r'\b[0-9a-f]{16,}\b', re.I),
+    re.compile(r'[A-Za-z0-9+/_-]{32,}={0,2}'),
+    # طوابع Unix بالثواني أو بالميلي ثانية؛ بقية الأرقام تبقى لأنها إشارة الحقن المنطقي
+    re.compile(r'\b1\d{9}(?:\d{3})?\b')
+]
+TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]')
+
+def strip_reflections(text, reflected, min_length=3):
+    """إعادة القيم المحقونة المنعكسة إلى قيمها الأصلية بصيغها الخام والمهربة"""
+    for injected, original in reflected:
+        if len(injected) < min_length:
+            continue
+        for escape in (lambda value: value, html.escape,
+                       lambda value: html.escape(value, quote=False)):
+            text = text.replace(escape(injected), escape(original))
+    return text
+
+def normalize_text(text, max_chars=262144):
+    """إزالة المناطق المتغيرة وتوحيد المسافات"""
+    text = text[:max_chars]
+    for pattern in VOLATILE_PATTERNS:
+        if pattern.groups:
+            text = pattern.sub(lambda m: m.group(1) + '""', text)
+        else:
+            text = pattern.sub('0', text)
+    return ' '.join(text.lower().split())
+
+def content_hash(text):
+    """بصمة ثابتة لمحتوى الصفحة بعد إزالة المناطق المتغيرة بين الطلبات"""
+    return hashlib.blake2b(normalize_text(text).encode('utf-8'), digest_size=16).hexdigest()
+
+def simhash(features, bits=64):
+    """حساب بصمة SimHash من مجموعة خصائص"""
+    weights = [0] * bits
+    for feature in features:
+        value = int.from_bytes(
+            hashlib.blake2b(feature.encode('utf-8'), digest_size=bits // 8).digest(), 'big'
+        )
+        for bit in range(bits):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    result = 0
+    for bit in range(bits):
+        if weights[bit] > 0:
+            result |= 1 << bit
+    return result
+
+def hamming_distance(first, second):
+    """عدد البتات المختلفة بين بصمتين"""
+    return bin(first ^ second).count('1')
+
+class Fingerprint:
+    """بصمة مضغوطة لاستجابة HTTP بعد إزالة المحتوى المتغير"""
+
+    def __init__(self, status_code, text, reflected=(), shingle_size=4):
+        normalized = normalize_text(strip_reflections(text, reflected))
+        tokens = TOKEN_PATTERN.findall(normalized)
+        shingles = {
+            ' '.join(tokens[index:index + shingle_size])
+            for index in range(max(len(tokens) - shingle_size + 1, 1))
+        }
+        self.status_code = status_code
+        self.length = len(normalized)
+        self.digest = hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).hexdigest()
+        self.simhash = simhash(shingles)
+
+    @classmethod
+    def from_response(cls, response, reflected=()):
+        """إنشاء بصمة من كائن استجابة مع تحييد القيم المنعكسة"""
+        return cls(response.status_code, response.text, reflected)
+
+    def distance(self, other):
+        """المسافة بين بصمتين: صفر عند التطابق التام"""
+        if self.status_code != other.status_code:
+            return 64
+        if self.digest == other.digest:
+            return 0
+        return hamming_distance(self.simhash, other.simhash)
+
+class Baseline:
+    """خط أساس لنقطة نهاية مع مقدار الضجيج الطبيعي بين عيناته"""
+
+    def __init__(self, fingerprints, margin=3):
+        self.fingerprints = fingerprints
+        self.noise = max(
+            (a.distance(b) for a in fingerprints for b in fingerprints if a is not b),
+            default=0
+        )
+        self.tolerance = self.noise + margin
+
+    def distance(self, fingerprint):
+        """أقرب مسافة بين البصمة وعينات خط الأساس"""
+        return min(fingerprint.distance(sample) for sample in self.fingerprints)
+
+    def differs(self, fingerprint):
+        """التحقق من اختلاف البصمة عن خط الأساس بأكثر من الضجيج"""
+        return self.distance(fingerprint) > self.tolerance
+
+class BaselineStore:
+    """تخزين خطوط الأساس لكل نقطة نهاية وجلبها مرة واحدة فقط"""
+
+    def __init__(self, samples=2, margin=3):
+        self.samples = samples
+        self.margin = margin
+        self._baselines = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, fetch):
+        """جلب خط الأساس أو بناؤه من عدد قليل من الطلبات
+
+        يعيد None دون تخزين إن أعادت fetch() قيمة None (نفاد ميزانية الطلبات).
+        """
+        with self._lock:
+            if key in self._baselines:
+                return self._baselines[key]
+            key_lock = self._locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            if key not in self._baselines:
+                fingerprints = []
+                for _ in range(self.samples):
+                    response = fetch()
+                    if response is None:
+                        return None
+                    fingerprints.append(Fingerprint.from_response(response))
+                self._baselines[key] = Baseline(fingerprints, self.margin)
+            return self._baselines[key]
+
+    def __len__(self):
+        return len(self._baselines)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+from html.parser import HTMLParser
+
+FORM_FIELDS = ('input', 'textarea', 'select')
+
+class LinkFormCollector:
+    """مجمّع تدفقي للروابط والنماذج دون بناء شجرة DOM كاملة"""
+
+    def __init__(self):
+        self.links = []
+        self.forms = []
+        self._form = None
+
+    def start(self, tag, attrs):
+        """معالجة وسم افتتاحي"""
+        tag = tag.lower()
+        if tag == 'a':
+            href = attrs.get('href')
+            if href:
+                self.links.append(href.strip())
+        elif tag == 'form':
+            self._form = {
+                'action': attrs.get('action') or '',
+                'method': (attrs.get('method') or 'get').lower(),
+                'inputs': []
+            }
+            self.forms.append(self._form)
+        elif tag in FORM_FIELDS and self._form is not None:
+            name = attrs.get('name')
+            if name:
+                self._form['inputs'].append({
+                    'name': name,
+                    'type': (attrs.get('type') or 'text').lower(),
+                    'value': attrs.get('value') or ''
+                })
+
+    def end(self, tag):
+        """معالجة وسم ختامي"""
+        if tag.lower() == 'form':
+            self._form = None
+
+    def data(self, data):
+        pass
+
+    def close(self):
+        return {'links': self.links, 'forms': self.forms}
+
+class _StdlibExtractor(HTMLParser):
+    """محلل مكتبة بايثون القياسية موصول بالمجمّع التدفقي"""
+
+    def __init__(self, collector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag, {name: value or '' for name, value in attrs})
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        self.collector.end(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+def extract_stdlib(html, chunk_size=65536):
+    """استخراج الروابط والنماذج بمحلل html.parser"""
+    collector = LinkFormCollector()
+    parser = _StdlibExtractor(collector)
+    for offset in range(0, len(html), chunk_size):
+        parser.feed(html[offset:offset + chunk_size])
+    parser.close()
+    return collector.close()
+
+def extract_lxml(html, chunk_size=65536):
+    """استخراج الروابط والنماذج بمحلل lxml في وضع الهدف دون بناء شجرة"""
+    from lxml import etree
+
+    parser = etree.HTMLParser(target=LinkFormCollector(), recover=True)
+    for offset in range(0, len(html), chunk_size):
+        parser.feed(html[offset:offset + chunk_size])
+    return parser.close()
+
+def extract_selectolax(html):
+    """استخراج الروابط والنماذج بمحلل selectolax"""
+    from selectolax.parser import HTMLParser as SelectolaxParser
+
+    tree = SelectolaxParser(html)
+    links = [
+        node.attributes['href'].strip()
+        for node in tree.css('a[href]') if node.attributes.get('href')
+    ]
+    forms = []
+    for node in tree.css('form'):
+        inputs = []
+        for field in node.css(', '.join(FORM_FIELDS)):
+            name = field.attributes.get('name')
+            if name:
+                inputs.append({
+                    'name': name,
+                    'type': (field.attributes.get('type') or 'text').lower(),
+                    'value': field.attributes.get('value') or ''
+                })
+        forms.append({
+            'action': node.attributes.get('action') or '',
+            'method': (node.attributes.get('method') or 'get').lower(),
+            'inputs': inputs
+        })
+    return {'links': links, 'forms': forms}
+
+# الواجهات الخلفية مرتبة حسب الأفضلية
+BACKENDS = {
+    'selectolax': ('selectolax.parser', extract_selectolax),
+    'lxml': ('lxml.etree', extract_lxml),
+    'html.parser': (None, extract_stdlib)
+}
+
+def available_backends():
+    """قائمة الواجهات الخلفية المثبتة"""
+    names = []
+    for name, (module, _) in BACKENDS.items():
+        if module is None:
+            names.append(name)
+            continue
+        try:
+            __import__(module)
+            names.append(name)
+        except ImportError:
+            pass
+    return names
+
+_default_backend = None
+
+def get_extractor(backend=None):
+    """اختيار دالة الاستخراج: المحددة أو الأسرع المتاحة"""
+    global _default_backend
+    if backend is None:
+        if _default_backend is None:
+            _default_backend = available_backends()[0]
+        backend = _default_backend
+    if backend not in BACKENDS:
+        raise ValueError(f'Unknown HTML parser backend: {backend}')
+    return BACKENDS[backend][1]
+
+def extract_links_and_forms(html, backend=None):
+    """استخراج الروابط والنماذج من نص HTML"""
+    return get_extractor(backend)(html)
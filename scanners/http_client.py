@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.retry import Retry
+from urllib.parse import urlparse
+import socket
+import time
+
+from .resolver import Resolver
+
+DEFAULT_USER_AGENT = 'Web-Hack Security Scanner v1.0 (SayerLinux)'
+# الحد الافتراضي لحجم جسم الاستجابة المقروء في الذاكرة لكل طلب
+DEFAULT_MAX_BODY = 10 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+# تداخل بين الدفعات حتى لا تفوت علامة مقسومة على حدّي دفعتين
+MATCH_OVERLAP = 1024
+
+def content_length(response):
+    """الحجم الكامل للمورد من الترويسات دون قراءة الجسم"""
+    content_range = response.headers.get('Content-Range', '')
+    if '/' in content_range and content_range.rsplit('/', 1)[1].isdigit():
+        return int(content_range.rsplit('/', 1)[1])
+    length = response.headers.get('Content-Length')
+    return int(length) if length and length.isdigit() else None
+
+class _ResolvingConnection:
+    """اتصال urllib3 يأخذ عناوين المضيف من المحلل المشترك بدل سؤال DNS"""
+
+    resolver = None
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            addresses = self.resolver.resolve(host)
+        except socket.gaierror as e:
+            # الفشل المخزن لا يُعاد استعلامه في محاولات urllib3 التالية
+            raise NewConnectionError(self, f'Failed to resolve {host!r} ({e})') from e
+        error = None
+        try:
+            for address in addresses:
+                # يتغير عنوان الاتصال فقط، ويبقى اسم المضيف لترويسة Host وشهادة TLS
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except ConnectTimeoutError as e:
+                    error = e
+        finally:
+            self._dns_host = host
+        raise error
+
+def resolving_pool(pool_class, resolver):
+    """صنف مجمع اتصالات urllib3 تحل اتصالاته أسماءها عبر resolver"""
+    base = pool_class.ConnectionCls
+    connection_class = type(base.__name__, (_ResolvingConnection, base), {'resolver': resolver})
+    return type(pool_class.__name__, (pool_class,), {'ConnectionCls': connection_class})
+
+class ResolvingAdapter(HTTPAdapter):
+    """محول requests يمرر اتصالاته الجديدة عبر ذاكرة DNS المشتركة"""
+
+    def __init__(self, resolver, **kwargs):
+        # init_poolmanager يُستدعى من منشئ الأب
+        self.resolver = resolver
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': resolving_pool(HTTPConnectionPool, self.resolver),
+            'https': resolving_pool(HTTPSConnectionPool, self.resolver)
+        }
+
+class HTTPClient:
+    """عميل HTTP مشترك يعيد استخدام الاتصالات بين جميع الماسحات"""
+
+    def __init__(self, pool_connections=10, pool_maxsize=20, timeout=10,
+                 retries=2, backoff_factor=0.3, headers=None, verify=True, rate_limiter=None,
+                 metrics=None, max_body=DEFAULT_MAX_BODY, resolver=None):
+        self.timeout = timeout
+        self.verify = verify
+        self.max_body = max_body
+        # محدد المعدل المشترك (اختياري) لجميع الطلبات عبر هذا العميل
+        self.rate_limiter = rate_limiter
+        # طبقة القياس (اختيارية): عدد الطلبات وأزمنتها وأحجامها لكل مضيف
+        self.metrics = metrics
+        # ذاكرة DNS (قد يشاركها ماسح المنافذ): يُحل كل مضيف مرة حتى انتهاء TTL
+        self.resolver = resolver if resolver else Resolver()
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': DEFAULT_USER_AGENT,
+            'Connection': 'keep-alive'
+        })
+        if headers:
+            self.session.headers.update(headers)
+
+        # سياسة إعادة المحاولة للأخطاء المؤقتة فقط
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+            raise_on_status=False
+        )
+        # مجمع اتصالات لكل مضيف بحجم قابل للضبط
+        adapter = ResolvingAdapter(
+            self.resolver,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def request(self, method, url, max_bytes=None, until=None, **kwargs):
+        """إرسال طلب عبر الجلسة المشتركة
+
+        يُقرأ الجسم على دفعات حتى max_bytes (أو حد العميل)، ويتوقف التنزيل
+        مبكرًا متى وُجد النص until أو أعادت الدالة until قيمة صحيحة.
+        الطلبات التي تمرر stream=True تتولى قراءة الجسم بنفسها.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        kwargs.setdefault('verify', self.verify)
+        limit = None if kwargs.get('stream') else (max_bytes or self.max_body)
+        if self.rate_limiter is None and self.metrics is None:
+            return self._send(method, url, limit, until, kwargs)
+
+        host = urlparse(url).netloc
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(host)
+        if self.metrics is not None:
+            self.metrics.request_started(host)
+        started = time.monotonic()
+        response = None
+        error = None
+        try:
+            response = self._send(method, url, limit, until, kwargs)
+        except requests.exceptions.Timeout:
+            error = 'timeout'
+            if self.rate_limiter is not None:
+                self.rate_limiter.feedback(host, timed_out=True)
+            raise
+        except BaseException:
+            error = 'error'
+            raise
+        finally:
+            if self.metrics is not None:
+                self.record(host, time.monotonic() - started, response, error, kwargs.get('stream'))
+        if self.rate_limiter is not None:
+            self.rate_limiter.feedback(
+                host,
+                response.status_code,
+                time.monotonic() - started,
+                response.headers.get('Retry-After')
+            )
+        return response
+
+    def _send(self, method, url, limit, until, kwargs):
+        if not limit:
+            return self.session.request(method, url, **kwargs)
+        response = self.session.request(method, url, **dict(kwargs, stream=True))
+        self.read_bounded(response, limit, until)
+        return response
+
+    @staticmethod
+    def read_bounded(response, max_bytes, until=None):
+        """قراءة جسم استجابة متدفقة بحد أقصى للحجم مع إمكانية التوقف المبكر
+
+        يُخزن الجزء المقروء في الاستجابة فتعمل text وcontent كالمعتاد،
+        وتشير response.truncated إلى أن الجسم لم يُقرأ كاملًا.
+        """
+        if isinstance(until, str):
+            needle = until
+            until = lambda text: needle in text
+        encoding = response.encoding or 'utf-8'
+        chunks = []
+        received = 0
+        tail = b''
+        truncated = False
+        try:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                chunks.append(chunk)
+                received += len(chunk)
+                if received >= max_bytes:
+                    truncated = True
+                    break
+                if until is not None:
+                    window = tail + chunk
+                    if until(window.decode(encoding, 'replace')):
+                        truncated = True
+                        break
+                    tail = window[-MATCH_OVERLAP:]
+            if truncated and getattr(response.raw, 'length_remaining', None) == 0:
+                # الجسم وصل كاملًا مع آخر دفعة: يعود الاتصال إلى المجمع
+                truncated = False
+                response._content_consumed = True
+        finally:
+            # الاتصال المقطوع قبل نهاية الجسم يُغلق ولا يعود إلى المجمع
+            response.close()
+        response._content = b''.join(chunks)[:max_bytes]
+        response._content_consumed = True
+        response.truncated = truncated
+        return response
+
+    def record(self, host, latency, response, error, stream=False):
+        """تسجيل الطلب في المقاييس مع أحجام الجسم المرسل والمستلم"""
+        if response is None:
+            self.metrics.request_finished(host, latency, error=error)
+            return
+        body = response.request.body if response.request is not None else None
+        if stream:
+            # الجسم المتدفق لم يُقرأ بعد: الحجم من الترويسة
+            received = int(response.headers.get('Content-Length') or 0)
+        else:
+            received = len(response.content or b'')
+        self.metrics.request_finished(
+            host, latency, response.status_code,
+            bytes_sent=len(body) if body else 0,
+            bytes_received=received
+        )
+
+    def get(self, url, **kwargs):
+        """إرسال طلب GET"""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        """إرسال طلب POST"""
+        return self.request('POST', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        """إرسال طلب HEAD"""
+        return self.request('HEAD', url, **kwargs)
+
+    def close(self):
+        """إغلاق جميع الاتصالات المفتوحة"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
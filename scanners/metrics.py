@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+
+# حدود مدرج زمن الاستجابة بالثواني (على نمط Prometheus)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """مدرج تكراري بحدود ثابتة مع المجموع والعدد"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """أزواج (الحد، العدد التراكمي) وآخرها +Inf"""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def quantile(self, q):
+        """تقدير المئين بالاستيفاء الخطي داخل الفئة"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        lower = 0.0
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            if count and seen + count >= rank:
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return self.buckets[-1]
+
+class _HostMetrics:
+    """عدادات طلبات HTTP لمضيف واحد"""
+
+    def __init__(self):
+        self.requests = 0
+        self.status_codes = {}
+        self.errors = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.in_flight = 0
+        self.latency = Histogram()
+
+class Metrics:
+    """طبقة قياس مشتركة بين الماسحات: طلبات وأخطاء وأزمنة كل مضيف ومرحلة
+
+    آمنة للاستدعاء من خيوط المحرك، وتُصدَّر كملخص JSON أو بصيغة نص
+    Prometheus. يُمرر محدد المعدل اختياريًا لإظهار الإبطاء الحالي لكل مضيف.
+    """
+
+    def __init__(self, rate_limiter=None):
+        self.rate_limiter = rate_limiter
+        self.started = time.monotonic()
+        self._hosts = {}
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host):
+        metrics = self._hosts.get(host)
+        if metrics is None:
+            metrics = self._hosts[host] = _HostMetrics()
+        return metrics
+
+    def request_started(self, host):
+        with self._lock:
+            self._host(host).in_flight += 1
+
+    def request_finished(self, host, latency, status_code=None, error=None,
+                         bytes_sent=0, bytes_received=0):
+        """تسجيل طلب منتهٍ: رمز الحالة أو نوع الخطأ (timeout أو error)"""
+        with self._lock:
+            metrics = self._host(host)
+            metrics.in_flight -= 1
+            metrics.requests += 1
+            metrics.latency.observe(latency)
+            metrics.bytes_sent += bytes_sent
+            metrics.bytes_received += bytes_received
+            if error:
+                metrics.errors[error] = metrics.errors.get(error, 0) + 1
+            if status_code is not None:
+                metrics.status_codes[status_code] = metrics.status_codes.get(status_code, 0) + 1
+
+    def stage_started(self, name):
+        with self._lock:
+            self._stages[name] = {'status': 'running', 'started': time.monotonic(), 'elapsed': None}
+
+    def stage_finished(self, name, status):
+        with self._lock:
+            stage = self._stages.setdefault(name, {'started': time.monotonic()})
+            stage['status'] = status
+            stage['elapsed'] = time.monotonic() - stage['started']
+
+    def totals(self):
+        """مجاميع جميع المضيفين: الطلبات والأخطاء والجارية والمعدل"""
+        with self._lock:
+            hosts = list(self._hosts.values())
+            requests = sum(host.requests for host in hosts)
+            errors = sum(sum(host.errors.values()) for host in hosts)
+            timeouts = sum(host.errors.get('timeout', 0) for host in hosts)
+            in_flight = sum(host.in_flight for host in hosts)
+            latency = Histogram()
+            for host in hosts:
+                latency.counts = [a + b for a, b in zip(latency.counts, host.latency.counts)]
+                latency.count += host.latency.count
+                latency.sum += host.latency.sum
+        elapsed = time.monotonic() - self.started
+        return {
+            'requests': requests,
+            'errors': errors,
+            'timeouts': timeouts,
+            'in_flight': in_flight,
+            'requests_per_second': requests / elapsed if elapsed > 0 else 0.0,
+            'latency_p50': latency.quantile(0.5),
+            'latency_p95': latency.quantile(0.95)
+        }
+
+    def status_line(self):
+        """سطر حالة مختصر لشريط التقدم يكشف التوقف أو الإبطاء"""
+        totals = self.totals()
+        line = (
+            f'{totals["requests"]} req, {totals["in_flight"]} in flight, '
+            f'{totals["requests_per_second"]:.1f} req/s'
+        )
+        if totals['latency_p95'] is not None:
+            line += f', p95 {totals["latency_p95"] * 1000:.0f}ms'
+        if totals['errors']:
+            line += f', [red]{totals["errors"]} errors[/red]'
+        return line
+
+    def snapshot(self):
+        """ملخص قابل للتسلسل بصيغة JSON"""
+        totals = self.totals()
+        with self._lock:
+            hosts = {}
+            for name, host in self._hosts.items():
+                hosts[name] = {
+                    'requests': host.requests,
+                    'status_codes': {str(code): count for code, count in host.status_codes.items()},
+                    'errors': dict(host.errors),
+                    'error_rate': sum(host.errors.values()) / host.requests if host.requests else 0.0,
+                    'bytes_sent': host.bytes_sent,
+                    'bytes_received': host.bytes_received,
+                    'in_flight': host.in_flight,
+                    'latency': {
+                        'count': host.latency.count,
+                        'sum': round(host.latency.sum, 6),
+                        'p50': host.latency.quantile(0.5),
+                        'p95': host.latency.quantile(0.95),
+                        'p99': host.latency.quantile(0.99),
+                        'buckets': {
+                            ('+Inf' if bound == float('inf') else str(bound)): count
+                            for bound, count in host.latency.cumulative()
+                        }
+                    }
+                }
+                if self.rate_limiter is not None:
+                    hosts[name]['rate_limit'] = self.rate_limiter.current_rate(name)
+            stages = {
+                name: {
+                    'status': stage['status'],
+                    'elapsed': round(
+                        stage['elapsed'] if stage['elapsed'] is not None
+                        else time.monotonic() - stage['started'], 3
+                    )
+                }
+                for name, stage in self._stages.items()
+            }
+        return {
+            'elapsed': round(time.monotonic() - self.started, 3),
+            'totals': totals,
+            'hosts': hosts,
+            'stages': stages
+        }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """تصدير المقاييس بصيغة نص Prometheus"""
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                lines.append(f'{name}{format_labels(labels)} {value}')
+
+        hosts = snapshot['hosts']
+        metric('webhack_http_requests_total', 'counter', 'HTTP requests by host and status code', [
+            ({'host': host, 'code': code}, count)
+            for host, data in hosts.items() for code, count in data['status_codes'].items()
+        ])
+        metric('webhack_http_errors_total', 'counter', 'Failed HTTP requests by host and kind', [
+            ({'host': host, 'kind': kind}, count)
+            for host, data in hosts.items() for kind, count in data['errors'].items()
+        ])
+        metric('webhack_http_sent_bytes_total', 'counter', 'Request body bytes sent', [
+            ({'host': host}, data['bytes_sent']) for host, data in hosts.items()
+        ])
+        metric('webhack_http_received_bytes_total', 'counter', 'Response body bytes received', [
+            ({'host': host}, data['bytes_received']) for host, data in hosts.items()
+        ])
+        metric('webhack_http_in_flight_requests', 'gauge', 'HTTP requests currently in flight', [
+            ({'host': host}, data['in_flight']) for host, data in hosts.items()
+        ])
+        if self.rate_limiter is not None:
+            metric('webhack_rate_limit_requests_per_second', 'gauge',
+                   'Current adaptive request rate per host', [
+                       ({'host': host}, data['rate_limit']) for host, data in hosts.items()
+                       if data.get('rate_limit') is not None
+                   ])
+
+        lines.append('# HELP webhack_http_request_duration_seconds HTTP request latency')
+        lines.append('# TYPE webhack_http_request_duration_seconds histogram')
+        for host, data in hosts.items():
+            latency = data['latency']
+            for bound, count in latency['buckets'].items():
+                labels = format_labels({'host': host, 'le': bound})
+                lines.append(f'webhack_http_request_duration_seconds_bucket{labels} {count}')
+            labels = format_labels({'host': host})
+            lines.append(f'webhack_http_request_duration_seconds_sum{labels} {latency["sum"]}')
+            lines.append(f'webhack_http_request_duration_seconds_count{labels} {latency["count"]}')
+
+        metric('webhack_stage_duration_seconds', 'gauge', 'Scan stage duration', [
+            ({'stage': name, 'status': stage['status']}, stage['elapsed'])
+            for name, stage in snapshot['stages'].items()
+        ])
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """حفظ المقاييس في ملف: نص Prometheus للامتداد .prom وإلا JSON"""
+        content = self.to_prometheus() if path.endswith('.prom') else self.to_json()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        f'{key}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for key, value in labels.items()
+    )
+    return '{' + ','.join(escaped) + '}'
+
+def serve_metrics(metrics, port, host='127.0.0.1'):
+    """تشغيل نقطة /metrics (Prometheus) و/metrics.json في خيط خلفي"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/metrics':
+                body = metrics.to_prometheus().encode('utf-8')
+                content_type = 'text/plain; version=0.0.4; charset=utf-8'
+            elif self.path == '/metrics.json':
+                body = metrics.to_json().encode('utf-8')
+                content_type = 'application/json'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+
+from rich.console import Console
+from urllib.parse import urlparse
+import asyncio
+import time
+
+from .engine import ScanEngine, progress_bar
+from .metrics import Metrics
+from .rate_limiter import RateLimiter
+from .registry import SCANNERS, load_scanner
+from .resolver import Resolver
+from .sink import NullSink
+from .state import NullState
+
+HTTP_PORTS = {80: 'http', 443: 'https', 8000: 'http', 8008: 'http', 8080: 'http', 8443: 'https', 8888: 'http'}
+
+# الماسحات المتاحة لكل نوع مسح
+SCAN_PROFILES = {
+    'quick': ['vulnerability', 'xss', 'sqli'],
+    'full': ['ports', 'vulnerability', 'xss', 'sqli', 'directory']
+}
+AVAILABLE_SCANNERS = list(SCANNERS)
+
+class Stage:
+    """مرحلة في مخطط المسح مع تبعياتها ومهلتها"""
+
+    def __init__(self, name, func, depends=(), timeout=None):
+        self.name = name
+        self.func = func
+        self.depends = tuple(depends)
+        self.timeout = timeout
+        self.status = 'pending'
+        self.result = None
+        self.error = None
+        self.elapsed = None
+
+class ScanOrchestrator:
+    """منسق يشغل الماسحات كمخطط تبعيات متوازٍ بموارد مشتركة
+
+    المراحل المستقلة تعمل بالتوازي. فشل مرحلة أو انتهاء مهلتها يتخطى
+    المراحل المعتمدة عليها فقط. استدعاء cancel() أو تجاوز المهلة العامة
+    يلغي كل المراحل الجارية والمنتظرة، وتبقى نتائج المراحل المكتملة متاحة.
+    """
+
+    def __init__(self, target, port=None, scan_type='quick', scanners=None,
+                 requests_per_second=20, concurrency=20, per_host_concurrency=5,
+                 stage_timeout=None, timeout=None, sink=None, state=None, incremental=False,
+                 port_method='connect', version_detection='banner', metrics=None, resolver=None):
+        self.target = target
+        self.port = port
+        self.scan_type = scan_type
+        self.scanners = self.resolve_scanners(scan_type, scanners)
+        self.stage_timeout = stage_timeout
+        self.port_method = port_method
+        self.version_detection = version_detection
+        self.timeout = timeout
+        self.console = Console()
+
+        # موارد مشتركة بين جميع المراحل
+        self.rate_limiter = RateLimiter(per_host=requests_per_second)
+        self.metrics = metrics if metrics else Metrics(rate_limiter=self.rate_limiter)
+        # ذاكرة DNS واحدة لماسح المنافذ وعميل HTTP (وللأهداف الأخرى في الدفعة)
+        self.resolver = resolver if resolver else Resolver()
+        self.client = None
+        self.cache = None
+        if any(name != 'ports' for name in self.scanners):
+            # عميل HTTP وطبقة requests لا تُستورد لمسح المنافذ وحده
+            from .http_client import HTTPClient
+            from .response_cache import ResponseCache
+            self.client = HTTPClient(
+                pool_maxsize=max(concurrency, 10), rate_limiter=self.rate_limiter,
+                metrics=self.metrics, resolver=self.resolver
+            )
+            self.cache = ResponseCache()
+        self.engine = ScanEngine(concurrency, per_host_concurrency)
+        self.sink = sink if sink else NullSink()
+        # حالة المسح الدائمة: تُتخطى الأعمال المكتملة عند الاستئناف
+        self.state = state if state else NullState()
+        # المسح التزايدي: اختبار الحقن للصفحات المتغيرة منذ آخر مسح مكتمل فقط
+        self.incremental = incremental
+        self.unchanged_pages = 0
+        self.collapsed_links = 0
+        self.progress = None
+
+        self.addresses = []
+        self.services = []
+        self.site_maps = {}
+        self.instances = []
+        # ماسحات كل مرحلة لإيقافها تعاونيًا عند انتهاء مهلتها
+        self._stage_scanners = {}
+        self.stages = {}
+        self._tasks = {}
+        self._cancelled = False
+        self._loop = None
+        self._main_task = None
+
+    @staticmethod
+    def resolve_scanners(scan_type, scanners=None):
+        """تحديد الماسحات المطلوبة حسب نوع المسح"""
+        if scan_type == 'custom':
+            selected = [name.strip() for name in scanners or [] if name.strip()]
+            unknown = [name for name in selected if name not in AVAILABLE_SCANNERS]
+            if unknown:
+                raise ValueError(f'Unknown scanners: {", ".join(unknown)}')
+            return selected or SCAN_PROFILES['quick']
+        return SCAN_PROFILES[scan_type]
+
+    @property
+    def hostname(self):
+        """اسم المضيف المجرد من المخطط والمنفذ"""
+        target = self.target if '://' in self.target else f'//{self.target}'
+        return urlparse(target).hostname or self.target
+
+    def default_service(self):
+        """خدمة HTTP الافتراضية عند عدم مسح المنافذ"""
+        parsed = urlparse(self.target if '://' in self.target else f'http://{self.target}')
+        port = self.port or parsed.port
+        netloc = f'{parsed.hostname}:{port}' if port else parsed.hostname
+        return f'{parsed.scheme}://{netloc}/'
+
+    def build_stages(self):
+        """بناء مخطط المراحل: حل الاسم ← المنافذ ← الخدمات ← الزحف ← الحقن والمجلدات"""
+        stages = [Stage('resolve', self.run_resolve)]
+        if 'ports' in self.scanners:
+            stages.append(Stage('ports', self.run_ports, ['resolve']))
+            stages.append(Stage('services', self.run_services, ['ports']))
+        else:
+            stages.append(Stage('services', self.run_services, ['resolve']))
+
+        if 'vulnerability' in self.scanners:
+            stages.append(Stage('vulnerability', self.run_vulnerability, ['services']))
+        if 'directory' in self.scanners:
+            stages.append(Stage('directory', self.run_directory, ['services']))
+        if 'xss' in self.scanners or 'sqli' in self.scanners:
+            stages.append(Stage('crawl', self.run_crawl, ['services']))
+        if 'xss' in self.scanners:
+            stages.append(Stage('xss', self.run_xss, ['crawl']))
+        if 'sqli' in self.scanners:
+            stages.append(Stage('sqli', self.run_sqli, ['crawl']))
+
+        for stage in stages:
+            stage.timeout = self.stage_timeout
+        self.stages = {stage.name: stage for stage in stages}
+        return self.stages
+
+    def _attach(self, scanner, name):
+        """ربط الماسح بالموارد المشتركة وتسجيله للتقرير"""
+        scanner.progress = self.progress
+        scanner.sink = self.sink
+        # استعادة نتائج المسح السابق قبل ربط الحالة حتى لا تُرفض كمكررة
+        for finding in self.state.findings(name, scanner.target):
+            scanner.add_finding(finding)
+        scanner.state = self.state
+        self.instances.append(scanner)
+        self._stage_scanners.setdefault(name, []).append(scanner)
+        return scanner
+
+    def stop_scanners(self, name=None):
+        """إيقاف ماسحات مرحلة (أو جميع المراحل) التي تعمل في خيوط لا يصلها إلغاء asyncio"""
+        names = [name] if name else list(self._stage_scanners)
+        for stage_name in names:
+            for scanner in self._stage_scanners.get(stage_name, []):
+                stop = getattr(scanner, 'stop', None)
+                if stop is not None:
+                    stop()
+
+    async def run_resolve(self):
+        """حل اسم الهدف مرة واحدة قبل أي مسح، ويتخطى فشله بقية المراحل"""
+        try:
+            self.addresses = await self.resolver.resolve_async(self.hostname)
+        except OSError as e:
+            raise ValueError(f'Cannot resolve {self.hostname}: {e}') from e
+        return self.addresses
+
+    async def run_ports(self):
+        scanner = self._attach(load_scanner('ports')(
+            self.hostname, self.port, engine=self.engine,
+            method=self.port_method, version_detection=self.version_detection,
+            resolver=self.resolver, timeout=self.stage_timeout or self.timeout
+        ), 'ports')
+        if not self.state.stage_done('ports'):
+            await scanner.scan_async()
+        return scanner.results
+
+    async def run_services(self):
+        """استخراج خدمات HTTP من نتائج مسح المنافذ"""
+        ports = self.stages.get('ports')
+        if not ports:
+            self.services = [self.default_service()]
+            return self.services
+
+        services = []
+        for result in ports.result or []:
+            if result['state'] != 'open':
+                continue
+            service = result['service'] or ''
+            scheme = HTTP_PORTS.get(result['port'])
+            if 'http' in service:
+                scheme = 'https' if ('https' in service or 'ssl' in service) else 'http'
+            if scheme:
+                services.append(f'{scheme}://{self.hostname}:{result["port"]}/')
+        self.services = services
+        return services
+
+    async def run_vulnerability(self):
+        scanners = [
+            self._attach(load_scanner('vulnerability')(
+                url, client=self.client, cache=self.cache, engine=self.engine
+            ), 'vulnerability')
+            for url in self.services
+        ]
+        results = await self.engine.gather(scanner.scan_async() for scanner in scanners)
+        return [finding for result in results for finding in result]
+
+    async def run_directory(self):
+        scanners = [
+            self._attach(
+                load_scanner('directory')(url, client=self.client, engine=self.engine), 'directory'
+            )
+            for url in self.services
+        ]
+        results = await self.engine.gather(scanner.scan_async() for scanner in scanners)
+        return [finding for result in results for finding in result]
+
+    async def run_crawl(self):
+        from .crawler import Crawler
+
+        async def crawl(url):
+            crawler = Crawler(
+                url, client=self.client, engine=self.engine, state=self.state,
+                incremental=self.incremental
+            )
+            self.site_maps[url] = await crawler.crawl_async()
+            self.unchanged_pages += crawler.unchanged
+            self.collapsed_links += crawler.collapsed
+
+        await self.engine.gather(crawl(url) for url in self.services)
+        return self.site_maps
+
+    def injection_site_map(self, url):
+        """خريطة الموقع المراد اختبارها: الصفحات المتغيرة فقط في المسح التزايدي"""
+        site_map = self.site_maps.get(url)
+        if self.incremental and site_map is not None:
+            return site_map.changed()
+        return site_map
+
+    def carry_over(self, name, scanner, url):
+        """نقل نتائج المسح السابق للصفحات التي لم تتغير ولن يُعاد اختبارها"""
+        site_map = self.site_maps.get(url)
+        if site_map is None:
+            return
+        unchanged = site_map.unchanged_urls()
+        for finding in self.state.previous_findings(name, scanner.target):
+            if finding.get('url') in unchanged:
+                scanner.add_finding(finding)
+
+    async def _run_injection(self, name):
+        scanner_class = load_scanner(name)
+        scanners = [
+            (self._attach(scanner_class(url, client=self.client, engine=self.engine), name), url)
+            for url in self.services
+        ]
+        if self.incremental:
+            for scanner, url in scanners:
+                self.carry_over(name, scanner, url)
+        results = await self.engine.gather(
+            scanner.scan_async(self.injection_site_map(url)) for scanner, url in scanners
+        )
+        return [finding for result in results for finding in result]
+
+    async def run_xss(self):
+        return await self._run_injection('xss')
+
+    async def run_sqli(self):
+        return await self._run_injection('sqli')
+
+    async def _run_stage(self, stage):
+        """تشغيل مرحلة واحدة مع مهلتها وتسجيل حالتها"""
+        started = time.monotonic()
+        stage.status = 'running'
+        self.metrics.stage_started(stage.name)
+        try:
+            if stage.timeout:
+                stage.result = await asyncio.wait_for(stage.func(), stage.timeout)
+            else:
+                stage.result = await stage.func()
+            stage.status = 'done'
+        except asyncio.TimeoutError:
+            stage.status = 'timeout'
+            stage.error = f'Stage timed out after {stage.timeout}s'
+            self.stop_scanners(stage.name)
+        except asyncio.CancelledError:
+            stage.status = 'cancelled'
+            self.stop_scanners(stage.name)
+            raise
+        except Exception as e:
+            stage.status = 'failed'
+            stage.error = str(e)
+        finally:
+            stage.elapsed = time.monotonic() - started
+            self.metrics.stage_finished(stage.name, stage.status)
+            self.state.set_stage(stage.name, stage.status)
+        return stage
+
+    async def run_async(self):
+        """تنفيذ المخطط: كل مرحلة تبدأ فور اكتمال تبعياتها"""
+        self.build_stages()
+        pending = dict(self.stages)
+        self._loop = asyncio.get_running_loop()
+        self._main_task = asyncio.current_task()
+
+        shared_progress = self.progress
+        with progress_bar(shared_progress) as progress:
+            self.progress = progress
+            ticker = asyncio.ensure_future(self._show_metrics(progress)) if self.client else None
+            deadline = time.monotonic() + self.timeout if self.timeout else None
+            try:
+                while pending or self._tasks:
+                    # تخطي المراحل التي فشلت إحدى تبعياتها
+                    for name, stage in list(pending.items()):
+                        failed = [
+                            dep for dep in stage.depends
+                            if self.stages[dep].status in ('failed', 'timeout', 'skipped', 'cancelled')
+                        ]
+                        if failed:
+                            stage.status = 'skipped'
+                            stage.error = f'Dependency not completed: {", ".join(failed)}'
+                            del pending[name]
+
+                    # إطلاق المراحل الجاهزة
+                    for name, stage in list(pending.items()):
+                        if all(self.stages[dep].status == 'done' for dep in stage.depends):
+                            self._tasks[name] = asyncio.ensure_future(self._run_stage(stage))
+                            del pending[name]
+
+                    if not self._tasks:
+                        break
+                    if self._cancelled:
+                        raise asyncio.CancelledError()
+
+                    remaining = deadline - time.monotonic() if deadline else None
+                    if remaining is not None and remaining <= 0:
+                        raise asyncio.TimeoutError()
+                    done, _ = await asyncio.wait(
+                        self._tasks.values(), timeout=remaining,
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for name, task in list(self._tasks.items()):
+                        if task in done:
+                            del self._tasks[name]
+
+            except (asyncio.CancelledError, asyncio.TimeoutError) as e:
+                reason = 'timeout' if isinstance(e, asyncio.TimeoutError) else 'cancelled'
+                await self._cancel_running(reason)
+                for stage in pending.values():
+                    stage.status = 'skipped'
+                    stage.error = f'Scan {reason}'
+            finally:
+                if ticker is not None:
+                    ticker.cancel()
+                    await asyncio.gather(ticker, return_exceptions=True)
+                self.progress = shared_progress
+                if any(stage.status in ('timeout', 'cancelled') for stage in self.stages.values()):
+                    # إسقاط الأعمال المنتظرة دون انتظار خيوط المراحل الموقوفة
+                    self.engine.shutdown(wait=False)
+
+        return self.stages
+
+    async def _show_metrics(self, progress, interval=0.5):
+        """تحديث سطر مقاييس HTTP الحية أسفل أشرطة التقدم"""
+        label = f'[cyan]HTTP {self.hostname}:'
+        task = progress.add_task(f'{label} waiting...', total=None)
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                progress.update(task, description=f'{label} {self.metrics.status_line()}')
+        finally:
+            progress.update(task, description=f'{label} {self.metrics.status_line()}', total=1, completed=1)
+
+    async def _cancel_running(self, reason):
+        """إلغاء جميع المراحل الجارية وانتظار انتهائها"""
+        self.stop_scanners()
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        for name in self._tasks:
+            self.stages[name].status = reason
+        self._tasks = {}
+
+    def cancel(self):
+        """طلب إلغاء المسح من أي خيط: لا تبدأ مراحل جديدة وتُلغى الجارية"""
+        self._cancelled = True
+        if self._loop is not None and self._main_task is not None:
+            self._loop.call_soon_threadsafe(self._main_task.cancel)
+
+    def run(self):
+        """غلاف متزامن لتشغيل المسح الكامل"""
+        try:
+            return self.engine.run(self.run_async())
+        except KeyboardInterrupt:
+            self.console.print('[yellow]Scan interrupted by user.[/yellow]')
+            return self.stages
+        finally:
+            self.close()
+
+    def close(self):
+        """تحرير الموارد المشتركة بعد انتهاء المسح"""
+        self.engine.shutdown()
+        if self.client is not None:
+            self.client.close()
+
+    def summary(self):
+        """ملخص قابل للتسلسل بصيغة JSON لحالة المراحل ونتائجها"""
+        return {
+            'target': self.target,
+            'scan_id': self.state.scan_id,
+            'scan_type': self.scan_type,
+            'addresses': self.addresses,
+            'services': self.services,
+            'pages': sum(len(site_map.pages) for site_map in self.site_maps.values()),
+            'unchanged_pages': self.unchanged_pages,
+            'collapsed_links': self.collapsed_links,
+            'endpoints': sum(len(site_map.endpoints) for site_map in self.site_maps.values()),
+            'duplicate_endpoints': sum(site_map.duplicates for site_map in self.site_maps.values()),
+            'stages': {
+                stage.name: {
+                    'status': stage.status,
+                    'elapsed': round(stage.elapsed, 3) if stage.elapsed is not None else None,
+                    'error': stage.error
+                }
+                for stage in self.stages.values()
+            },
+            'metrics': self.metrics.snapshot(),
+            'dns': self.resolver.stats(),
+            'findings': {
+                stage.name: stage.result
+                for stage in self.stages.values()
+                if stage.name not in ('resolve', 'services', 'crawl') and stage.result
+            }
+        }
+
+    def generate_report(self):
+        """طباعة تقارير الماسحات وملخص المراحل"""
+        for scanner in self.instances:
+            scanner.generate_report()
+
+        self.console.print('\n[bold green]===== Scan Stages =====[/bold green]')
+        colors = {'done': 'green', 'failed': 'red', 'timeout': 'red', 'cancelled': 'yellow', 'skipped': 'yellow'}
+        for stage in self.stages.values():
+            color = colors.get(stage.status, 'white')
+            elapsed = f' ({stage.elapsed:.1f}s)' if stage.elapsed is not None else ''
+            line = f'[{color}]{stage.name}: {stage.status}{elapsed}[/{color}]'
+            if stage.error:
+                line += f' - {stage.error}'
+            self.console.print(line)
+
+        if self.incremental:
+            self.console.print(
+                f'\nIncremental scan: {self.unchanged_pages} unchanged pages skipped for injection tests'
+            )
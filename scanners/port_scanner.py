@@ -1,23 +1,67 @@
 #!/usr/bin/env python3
 
-import nmap
 from rich.console import Console
-from rich.progress import Progress
+import asyncio
 import socket
 import sys
+import threading
+
+from .connect_scanner import ConnectScanner, grab_banner, identify_service, parse_ports, service_name
+from .engine import ScanEngine, progress_bar
+from .resolver import Resolver
+from .sink import NullSink
+from .state import NullState
 
 class PortScanner:
-    def __init__(self, target, ports=None):
+    def __init__(self, target, ports=None, engine=None, sink=None, state=None,
+                 method='connect', version_detection='banner', concurrency=500, resolver=None,
+                 timeout=None):
         self.target = target
         self.ports = ports if ports else '1-1000'
+        # connect: ماسح asyncio مدمج دون صلاحيات الجذر، nmap: مسح SYN عبر nmap
+        self.method = method
+        # كشف الإصدار للمنافذ المفتوحة فقط: banner أو nmap أو None
+        self.version_detection = version_detection
+        self.concurrency = concurrency
+        # مهلة عملية nmap بالثواني: تعمل في خيط لا يلغيه انتهاء مهلة المرحلة
+        self.timeout = timeout
+        self.stop_event = threading.Event()
+        self.port_states = {'open': 0, 'closed': 0, 'filtered': 0}
         self.console = Console()
-        self.nm = nmap.PortScanner()
+        self._nm = None
         self.results = []
+        self.engine = engine if engine else ScanEngine()
+        # شريط تقدم مشترك يمرره المنسق عند تشغيل عدة ماسحات معًا
+        self.progress = None
+        self.sink = sink if sink else NullSink()
+        self.state = state if state else NullState()
+        # ذاكرة DNS المشتركة مع طبقة HTTP عند التشغيل عبر المنسق
+        self.resolver = resolver if resolver else Resolver()
+        self.address = None
+
+    def stop(self):
+        """منع بدء عمليات nmap جديدة بعد إلغاء المسح"""
+        self.stop_event.set()
+
+    def add_finding(self, finding):
+        """تسجيل حالة منفذ وإرسالها إلى مخرج النتائج"""
+        if not self.state.add_finding('ports', self.target, finding):
+            return
+        self.results.append(finding)
+        self.sink.emit(finding, scanner='ports', target=self.target)
+
+    @property
+    def nm(self):
+        """إنشاء ماسح nmap عند أول استخدام لأن استيراده وتهيئته مكلفان"""
+        if self._nm is None:
+            import nmap
+            self._nm = nmap.PortScanner()
+        return self._nm
 
     def is_valid_target(self):
-        """التحقق من صحة الهدف"""
+        """التحقق من صحة الهدف وحفظ عنوانه"""
         try:
-            socket.gethostbyname(self.target)
+            self.address = self.resolver.resolve(self.target)[0]
             return True
         except socket.gaierror:
             return False
@@ -25,11 +69,12 @@ class PortScanner:
     def scan_tcp_ports(self):
         """مسح المنافذ TCP"""
         try:
-            with Progress() as progress:
+            with progress_bar(self.progress) as progress:
                 task = progress.add_task('[cyan]Scanning TCP ports...', total=100)
                 
-                # تنفيذ المسح باستخدام nmap
-                self.nm.scan(self.target, self.ports, arguments='-sS -sV -Pn')
+                # تنفيذ المسح باستخدام nmap على العنوان المحلول مسبقًا
+                self.nm.scan(self.address or self.target, self.ports, arguments='-sS -sV -Pn',
+                             timeout=self.timeout or 0)
                 progress.update(task, completed=100)
 
                 # معالجة النتائج
@@ -41,7 +86,7 @@ class PortScanner:
                             service = self.nm[host][proto][port]['name']
                             version = self.nm[host][proto][port]['version']
                             
-                            self.results.append({
+                            self.add_finding({
                                 'port': port,
                                 'protocol': proto,
                                 'state': state,
@@ -55,14 +100,92 @@ class PortScanner:
 
         return True
 
+    def detect_versions(self, ports):
+        """كشف إصدارات الخدمات عبر nmap للمنافذ المفتوحة فقط"""
+        self.nm.scan(self.address or self.target, ','.join(str(port) for port in ports),
+                     arguments='-sV -Pn', timeout=self.timeout or 0)
+        versions = {}
+        for host in self.nm.all_hosts():
+            for port in self.nm[host].get('tcp', {}):
+                info = self.nm[host]['tcp'][port]
+                versions[port] = (info['name'], ' '.join(
+                    part for part in (info.get('product'), info.get('version')) if part
+                ))
+        return versions
+
+    async def scan_connect(self):
+        """مسح TCP connect غير متزامن مع نتائج متدفقة لكل منفذ"""
+        loop = asyncio.get_running_loop()
+        try:
+            address = self.address = (await self.resolver.resolve_async(self.target))[0]
+        except socket.gaierror:
+            self.console.print(f'[red]Invalid target: {self.target}[/red]')
+            return False
+
+        try:
+            ports = parse_ports(self.ports)
+        except ValueError as e:
+            self.console.print(f'[red]Error during port scan: {str(e)}[/red]')
+            return False
+
+        scanner = ConnectScanner(address, ports, self.concurrency)
+        open_ports = []
+        with progress_bar(self.progress) as progress:
+            task = progress.add_task('[cyan]Scanning TCP ports...', total=len(ports))
+
+            async def on_result(port, state):
+                self.port_states[state] += 1
+                if state == 'open':
+                    if self.version_detection == 'banner':
+                        banner = await grab_banner(address, port, max(1.0, scanner.rtt.timeout * 4))
+                        service, version = identify_service(port, banner)
+                        self.add_open_port(port, service, version)
+                    else:
+                        open_ports.append(port)
+                progress.update(task, advance=1)
+
+            await scanner.scan(on_result)
+
+        versions = {}
+        if open_ports and self.version_detection == 'nmap' and not self.stop_event.is_set():
+            try:
+                versions = await loop.run_in_executor(None, self.detect_versions, open_ports)
+            except Exception as e:
+                self.console.print(f'[red]Error during version detection: {str(e)}[/red]')
+        for port in sorted(open_ports):
+            service, version = versions.get(port, (service_name(port), ''))
+            self.add_open_port(port, service, version)
+        return True
+
+    def add_open_port(self, port, service, version):
+        """تسجيل منفذ مفتوح مع خدمته وإصدارها"""
+        self.add_finding({
+            'port': port,
+            'protocol': 'tcp',
+            'state': 'open',
+            'service': service,
+            'version': version
+        })
+
     def scan(self):
         """تنفيذ المسح الكامل"""
+        if self.method == 'connect':
+            return self.engine.run(self.scan_connect())
+
         if not self.is_valid_target():
             self.console.print(f'[red]Invalid target: {self.target}[/red]')
             return False
+        if self.stop_event.is_set():
+            return False
 
         return self.scan_tcp_ports()
 
+    async def scan_async(self):
+        """تنفيذ المسح الكامل بشكل غير متزامن"""
+        if self.method == 'connect':
+            return await self.scan_connect()
+        return await self.engine.submit(self.target, self.scan)
+
     def generate_report(self):
         """إنشاء تقرير بنتائج المسح"""
         self.console.print('\n[bold green]===== Port Scan Report =====[/bold green]')
@@ -94,9 +217,12 @@ class PortScanner:
             for result in filtered_ports:
                 self.console.print(f"Port {result['port']}/{result['protocol']}")
 
-        # إحصائيات
+        # إحصائيات: ماسح connect يحتفظ بالمنافذ المفتوحة فقط ويعد البقية
+        total = sum(self.port_states.values()) or len(self.results)
+        filtered = self.port_states['filtered'] or len(filtered_ports)
+        closed = self.port_states['closed'] or len(closed_ports)
         self.console.print('\n[bold blue]Statistics:[/bold blue]')
-        self.console.print(f'Total ports scanned: {len(self.results)}')
+        self.console.print(f'Total ports scanned: {total}')
         self.console.print(f'Open ports: {len(open_ports)}')
-        self.console.print(f'Filtered ports: {len(filtered_ports)}')
-        self.console.print(f'Closed ports: {len(closed_ports)}')
\ No newline at end of file
+        self.console.print(f'Filtered ports: {filtered}')
+        self.console.print(f'Closed ports: {closed}')
\ No newline at end of file
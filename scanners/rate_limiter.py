@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import threading
+import time
+
+class TokenBucket:
+    """دلو رموز: معدل ثابت بالطلبات في الثانية مع سعة للدفعات"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst else max(rate, 1))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate):
+        """تغيير المعدل مع الاحتفاظ بالرموز المتراكمة"""
+        with self._lock:
+            self._refill()
+            self.rate = float(rate)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        """حجز رمز وإرجاع مدة الانتظار اللازمة قبل استخدامه"""
+        with self._lock:
+            self._refill()
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+def parse_retry_after(value):
+    """تحويل قيمة Retry-After (ثوانٍ أو تاريخ HTTP) إلى عدد ثوانٍ"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+class _HostState:
+    """حالة التحكم التكيفي لمضيف واحد"""
+
+    def __init__(self, rate):
+        self.base_rate = rate
+        self.rate = rate
+        self.bucket = TokenBucket(rate)
+        self.blocked_until = 0.0
+        self.latency = None
+        self.min_latency = None
+        self.adjusted = 0.0
+
+class RateLimiter:
+    """محدد معدل مشترك: دلو لكل مضيف ودلو عام مع إبطاء تكيفي"""
+
+    def __init__(self, requests_per_second=None, per_host=None, min_rate=0.5,
+                 backoff=0.5, recovery=0.1, latency_factor=2.0, latency_slack=0.05,
+                 max_retry_after=300):
+        self.global_bucket = TokenBucket(requests_per_second) if requests_per_second else None
+        self.per_host = per_host
+        self.min_rate = min_rate
+        self.backoff = backoff
+        self.recovery = recovery
+        self.latency_factor = latency_factor
+        self.latency_slack = latency_slack
+        self.max_retry_after = max_retry_after
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None and self.per_host:
+                state = self._hosts[host] = _HostState(self.per_host)
+            return state
+
+    def acquire(self, host):
+        """الانتظار حتى يُسمح بإرسال طلب إلى المضيف"""
+        state = self._state(host)
+        if state:
+            blocked = state.blocked_until - time.monotonic()
+            if blocked > 0:
+                time.sleep(blocked)
+            delay = state.bucket.reserve()
+            if delay:
+                time.sleep(delay)
+        if self.global_bucket:
+            delay = self.global_bucket.reserve()
+            if delay:
+                time.sleep(delay)
+
+    def _set_rate(self, state, rate):
+        state.rate = max(self.min_rate, min(state.base_rate, rate))
+        state.bucket.set_rate(state.rate)
+        state.adjusted = time.monotonic()
+
+    def feedback(self, host, status_code=None, latency=None, retry_after=None, timed_out=False):
+        """تعديل معدل المضيف حسب الاستجابة: إبطاء عند 429/503 أو ارتفاع زمن الاستجابة"""
+        state = self._state(host)
+        if state is None:
+            return
+
+        with self._lock:
+            if status_code in (429, 503) or timed_out:
+                # الطلبات الجارية قد تعيد 429 معًا: إبطاء واحد لكل دفعة
+                if time.monotonic() - state.adjusted >= 1.0:
+                    self._set_rate(state, state.rate * self.backoff)
+                wait = parse_retry_after(retry_after)
+                if wait is not None:
+                    state.blocked_until = time.monotonic() + min(wait, self.max_retry_after)
+                return
+
+            if latency is None:
+                return
+            state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+            state.min_latency = latency if state.min_latency is None else min(state.min_latency, latency)
+
+            # تعديل واحد في الثانية على الأكثر لتجنب التذبذب
+            if time.monotonic() - state.adjusted < 1.0:
+                return
+            if (state.latency > self.latency_factor * state.min_latency
+                    and state.latency - state.min_latency > self.latency_slack):
+                self._set_rate(state, state.rate * 0.8)
+            elif state.rate < state.base_rate:
+                self._set_rate(state, state.rate + state.base_rate * self.recovery)
+
+    def current_rate(self, host):
+        """المعدل الحالي للمضيف بعد التكيف"""
+        state = self._state(host)
+        return state.rate if state else None
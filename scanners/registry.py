@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+
+import importlib
+
+# سجل الماسحات: الاسم ← (الوحدة، الصنف). تُستورد الوحدة عند الطلب فقط
+SCANNERS = {
+    'ports': ('.port_scanner', 'PortScanner'),
+    'vulnerability': ('.vulnerability_scanner', 'VulnerabilityScanner'),
+    'xss': ('.xss_scanner', 'XSSScanner'),
+    'sqli': ('.sql_injection_scanner', 'SQLInjectionScanner'),
+    'directory': ('.directory_scanner', 'DirectoryScanner')
+}
+
+def load_scanner(name):
+    """استيراد صنف الماسح بالاسم عند الحاجة إليه"""
+    if name not in SCANNERS:
+        raise ValueError(f'Unknown scanner: {name}')
+    module, attribute = SCANNERS[name]
+    return getattr(importlib.import_module(module, __package__), attribute)
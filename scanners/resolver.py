@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+import asyncio
+import ipaddress
+import os
+import socket
+import threading
+import time
+
+# مدة صلاحية العناوين عند تعذر معرفة TTL من سجلات DNS (getaddrinfo لا يعيدها)
+DEFAULT_TTL = 300
+# مدة تذكر فشل الحل حتى لا يُعاد سؤال الخادم عن اسم غير موجود في كل طلب
+NEGATIVE_TTL = 30
+MIN_TTL = 5
+MAX_TTL = 3600
+# أقصى انتظار لاستعلام TTL: لا يجوز أن يؤخر المسح على شبكة بلا DNS
+DNS_LIFETIME = 1.0
+if os.name == 'nt':
+    HOSTS_FILE = os.path.join(os.environ.get('SystemRoot', r'C:\Windows'), 'System32', 'drivers', 'etc', 'hosts')
+else:
+    HOSTS_FILE = '/etc/hosts'
+
+def hosts_file_names(path=HOSTS_FILE):
+    """أسماء المضيفين المثبتة في ملف hosts"""
+    names = set()
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            for line in f:
+                fields = line.split('#', 1)[0].split()
+                names.update(name.lower().rstrip('.') for name in fields[1:])
+    except OSError:
+        pass
+    return names
+
+def is_ip_address(host):
+    try:
+        ipaddress.ip_address(host.strip('[]'))
+        return True
+    except ValueError:
+        return False
+
+class _Entry:
+    def __init__(self, addresses, expires, error=None):
+        self.addresses = addresses
+        self.expires = expires
+        self.error = error
+
+class Resolver:
+    """ذاكرة مؤقتة مشتركة لحل أسماء المضيفين تحترم مدة صلاحية السجلات
+
+    يُحل كل اسم مرة واحدة ثم تخدم الذاكرة ماسح المنافذ وطبقة HTTP حتى
+    انتهاء TTL. الطلبات المتزامنة للاسم نفسه تنتظر حلًا واحدًا بدل تكراره.
+    العناوين دائمًا من محلل النظام (فيُحترم ملف hosts). مدة صلاحية الأسماء
+    غير المثبتة في hosts تُقرأ باستعلام DNS واحد قصير عبر dnspython إن كانت
+    مثبتة، وإلا تُستخدم default_ttl.
+    """
+
+    def __init__(self, default_ttl=DEFAULT_TTL, negative_ttl=NEGATIVE_TTL,
+                 min_ttl=MIN_TTL, max_ttl=MAX_TTL, hosts_file=HOSTS_FILE):
+        self.default_ttl = default_ttl
+        self.hosts_file = hosts_file
+        self.negative_ttl = negative_ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.lookups = 0
+        self.hits = 0
+        self._cache = {}
+        self._pinned = None
+        self._dns = None
+        self._host_locks = {}
+        self._lock = threading.Lock()
+
+    def cached(self, host):
+        """العناوين المخزنة الصالحة للاسم أو None دون أي استعلام"""
+        key = host.lower().rstrip('.')
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or entry.expires <= time.monotonic():
+                return None
+            self.hits += 1
+        if entry.error:
+            raise socket.gaierror(*entry.error)
+        return entry.addresses
+
+    def resolve(self, host):
+        """قائمة عناوين المضيف (IPv4 أولًا)، ويُرفع socket.gaierror إن تعذر حله"""
+        if is_ip_address(host):
+            return [host.strip('[]')]
+        addresses = self.cached(host)
+        if addresses is not None:
+            return addresses
+
+        key = host.lower().rstrip('.')
+        with self._lock:
+            host_lock = self._host_locks.setdefault(key, threading.Lock())
+        with host_lock:
+            # ربما حله خيط آخر أثناء الانتظار
+            addresses = self.cached(host)
+            if addresses is not None:
+                return addresses
+            with self._lock:
+                self.lookups += 1
+            try:
+                addresses, ttl = self._lookup(key)
+            except socket.gaierror as e:
+                with self._lock:
+                    self._cache[key] = _Entry(None, time.monotonic() + self.negative_ttl, e.args)
+                raise
+            ttl = min(self.max_ttl, max(self.min_ttl, ttl))
+            with self._lock:
+                self._cache[key] = _Entry(addresses, time.monotonic() + ttl)
+            return addresses
+
+    async def resolve_async(self, host):
+        """نسخة غير متزامنة: الاسم المخزن يعود فورًا وإلا يُحل في خيط منفصل"""
+        if is_ip_address(host):
+            return [host.strip('[]')]
+        addresses = self.cached(host)
+        if addresses is not None:
+            return addresses
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.resolve, host)
+
+    async def resolve_all(self, hosts):
+        """حل عدة أسماء بالتوازي مسبقًا، وإرجاع {الاسم: العناوين أو None}"""
+        hosts = list(dict.fromkeys(hosts))
+        results = await asyncio.gather(
+            *(self.resolve_async(host) for host in hosts), return_exceptions=True
+        )
+        return {
+            host: None if isinstance(result, Exception) else result
+            for host, result in zip(hosts, results)
+        }
+
+    def _lookup(self, host):
+        infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        addresses.sort(key=lambda address: ':' in address)
+        if self._pinned is None:
+            self._pinned = hosts_file_names(self.hosts_file)
+        if host in self._pinned:
+            # عنوان ثابت من ملف hosts: لا يُسأل DNS عنه أصلًا
+            return addresses, self.default_ttl
+        ttl = self._record_ttl(host, addresses)
+        return addresses, self.default_ttl if ttl is None else ttl
+
+    def _record_ttl(self, host, addresses):
+        """TTL سجل العنوان الأول كما يراه DNS، أو None
+
+        استعلام واحد من نوع عائلة العنوان الأول بمهلة DNS_LIFETIME. لا تُستخدم
+        عناوين DNS نفسها، ويُعتمد TTL فقط إن تضمنت الإجابة عنوان محلل النظام.
+        """
+        try:
+            import dns.exception
+            import dns.resolver
+        except ImportError:
+            return None
+        try:
+            if self._dns is None:
+                self._dns = dns.resolver.Resolver()
+                self._dns.lifetime = DNS_LIFETIME
+            rdtype = 'AAAA' if ':' in addresses[0] else 'A'
+            answer = self._dns.resolve(host, rdtype, search=True)
+        except dns.exception.DNSException:
+            return None
+        if not any(record.address in addresses for record in answer):
+            return None
+        return answer.rrset.ttl
+
+    def stats(self):
+        """عدد الاستعلامات الفعلية والمرات التي خدمتها الذاكرة"""
+        with self._lock:
+            return {'lookups': self.lookups, 'hits': self.hits, 'cached': len(self._cache)}
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+from collections import OrderedDict
+import threading
+
+class ResponseCache:
+    """ذاكرة مؤقتة للاستجابات خلال المسح مع إخلاء LRU وحد أقصى للحجم"""
+
+    # الرؤوس التي تؤثر على محتوى الاستجابة
+    vary_headers = ('Accept', 'Accept-Language', 'Cookie', 'Authorization')
+
+    def __init__(self, max_entries=256, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def make_key(self, method, url, headers=None):
+        """بناء مفتاح التخزين من الطريقة والعنوان والرؤوس المؤثرة"""
+        headers = headers or {}
+        relevant = tuple(
+            (name, headers[name]) for name in self.vary_headers if name in headers
+        )
+        return (method.upper(), url, relevant)
+
+    def get(self, key):
+        """جلب استجابة مخزنة وتحديث ترتيب الاستخدام"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, response):
+        """تخزين استجابة مع احترام حدود العدد والحجم"""
+        size = len(response.content)
+        if size > self.max_bytes:
+            return None
+
+        entry = {'response': response, 'size': size, 'parsed': None}
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self.total_bytes -= old['size']
+            self._entries[key] = entry
+            self.total_bytes += size
+
+            # إخلاء الأقدم استخدامًا حتى العودة ضمن الحدود
+            while self._entries and (
+                len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= evicted['size']
+        return entry
+
+    def fetch(self, client, url, method='GET', headers=None, **kwargs):
+        """جلب الاستجابة من الذاكرة أو من الشبكة عند عدم وجودها"""
+        key = self.make_key(method, url, headers)
+        entry = self.get(key)
+        if entry is None:
+            response = client.request(method, url, headers=headers, **kwargs)
+            entry = self.put(key, response) or {'response': response, 'parsed': None}
+        return entry
+
+    def fetch_response(self, client, url, method='GET', headers=None, **kwargs):
+        """جلب كائن الاستجابة فقط"""
+        return self.fetch(client, url, method, headers, **kwargs)['response']
+
+    def fetch_parsed(self, client, url, parse, method='GET', headers=None, **kwargs):
+        """جلب الاستجابة المحللة مرة واحدة فقط"""
+        entry = self.fetch(client, url, method, headers, **kwargs)
+        if entry['parsed'] is None:
+            entry['parsed'] = parse(entry['response'].text)
+        return entry['response'], entry['parsed']
+
+    def clear(self):
+        """مسح جميع الاستجابات المخزنة"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+import re
+import secrets
+import threading
+
+# السمات التي تُفسَّر قيمتها كعنوان URL
+URL_ATTRIBUTES = ('href', 'src', 'action', 'formaction')
+
+def html_context(text, position, lowered=None):
+    """سياق HTML لموضع الانعكاس: html أو comment أو script أو قيمة سمة
+
+    قيم السمات تُميَّز حسب علامة الاقتباس (attr-double وattr-single
+    وattr-unquoted)، وقيم سمات العناوين مثل href تُعاد كـ url.
+    """
+    lowered = lowered if lowered is not None else text.lower()
+    if text.rfind('<!--', 0, position) > text.rfind('-->', 0, position):
+        return 'comment'
+    script = lowered.rfind('<script', 0, position)
+    if script > lowered.rfind('</script', 0, position) and text.find('>', script, position) >= 0:
+        return 'script'
+    tag = text.rfind('<', 0, position)
+    if tag <= text.rfind('>', 0, position):
+        return 'html'
+
+    # داخل وسم: تتبع علامات الاقتباس حتى موضع الانعكاس
+    quote = None
+    for char in text[tag:position]:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+    attribute = re.search(r'([\w:-]+)\s*=\s*["\']?[^"\'\s>]*$', lowered[tag:position])
+    if attribute and attribute.group(1) in URL_ATTRIBUTES:
+        return 'url'
+    if quote == '"':
+        return 'attr-double'
+    if quote == "'":
+        return 'attr-single'
+    return 'attr-unquoted'
+
+class PayloadScheduler:
+    """جدولة الحمولات: مسبار تمهيدي رخيص ثم التصعيد للمعاملات الواعدة فقط"""
+
+    special_chars = '\'"<>'
+
+    def __init__(self, max_payloads_per_param=None, max_requests=None, canary=True):
+        self.max_payloads_per_param = max_payloads_per_param
+        self.max_requests = max_requests
+        self.canary = canary
+        self.requests_sent = 0
+        self.skipped_params = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """حجز طلب واحد من الميزانية العامة"""
+        with self._lock:
+            if self.max_requests is not None and self.requests_sent >= self.max_requests:
+                return False
+            self.requests_sent += 1
+            return True
+
+    def exhausted(self):
+        """التحقق من نفاد الميزانية العامة"""
+        return self.max_requests is not None and self.requests_sent >= self.max_requests
+
+    def make_canary(self):
+        """إنشاء قيمة تمهيدية فريدة: الرمز ثم الرموز الخاصة ثم الرمز معكوسًا كعلامة نهاية"""
+        token = f'wh{secrets.token_hex(4)}'
+        return token, token + self.special_chars + token[::-1]
+
+    def surviving_chars(self, text, start, token):
+        """الرموز الخاصة المنعكسة حرفيًا بعد الرمز الذي ينتهي عند start
+
+        يُقرأ ما بين الرمز وعلامة النهاية فقط، فلا تُحسب علامات الصفحة المحيطة
+        بالانعكاس. إن حُذفت علامة النهاية يُقارن النص بلاحقة المسبار حرفًا
+        بحرف حتى أول اختلاف.
+        """
+        end = text.find(token[::-1], start, start + len(self.special_chars) * 8 + len(token))
+        if end < 0:
+            survived = set()
+            for offset, char in enumerate(self.special_chars):
+                if text[start + offset:start + offset + 1] != char:
+                    break
+                survived.add(char)
+            return survived
+        segment = text[start:end]
+        # الرمز المسبوق بشرطة مائلة عكسية مهرَّب ولا يكسر السياق
+        return {
+            char for index, char in enumerate(segment)
+            if char in self.special_chars and not (index and segment[index - 1] == '\\')
+        }
+
+    def reflected_chars(self, text, token):
+        """الرموز الخاصة التي انعكست دون ترميز، أو None إن لم تنعكس القيمة"""
+        position = text.find(token)
+        if position < 0:
+            return None
+
+        survived = set()
+        while position >= 0:
+            start = position + len(token)
+            survived |= self.surviving_chars(text, start, token)
+            position = text.find(token, start)
+        return survived
+
+    def make_canaries(self, names):
+        """قيمة تمهيدية فريدة لكل حقل، لإرسالها جميعًا في طلب واحد"""
+        return {name: self.make_canary() for name in names}
+
+    def reflections(self, text, tokens):
+        """مسح واحد للاستجابة يعيد لكل رمز منعكس: الرموز الخاصة الناجية وسياقات HTML"""
+        found = {}
+        if not tokens:
+            return found
+        lowered = text.lower()
+        pattern = re.compile('|'.join(re.escape(token) for token in tokens))
+        for match in pattern.finditer(text):
+            survived, contexts = found.setdefault(match.group(0), (set(), set()))
+            survived |= self.surviving_chars(text, match.end(), match.group(0))
+            contexts.add(html_context(text, match.start(), lowered))
+        return found
+
+    def skip(self):
+        """تسجيل معامل لم يستحق التصعيد"""
+        with self._lock:
+            self.skipped_params += 1
+
+    def schedule(self, payloads, allowed_chars=None):
+        """ترتيب الحمولات وتصفيتها حسب الرموز المسموح بها وميزانية المعامل"""
+        if allowed_chars is not None:
+            payloads = [
+                payload for payload in payloads
+                if all(char in allowed_chars for char in payload if char in self.special_chars)
+            ]
+        if self.max_payloads_per_param is not None:
+            payloads = payloads[:self.max_payloads_per_param]
+        return payloads
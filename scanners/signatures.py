@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import re
+import threading
+
+# تواقيع رسائل أخطاء قواعد البيانات المضمنة
+DEFAULT_SQL_ERROR_SIGNATURES = {
+    'MySQL': [
+        r'SQL syntax.*MySQL',
+        r'Warning.*mysql_.*'
+    ],
+    'PostgreSQL': [
+        r'PostgreSQL.*ERROR'
+    ],
+    'Microsoft SQL Server': [
+        r'Driver.*SQL.*Server',
+        r'Microsoft SQL Native Client.*'
+    ],
+    'Oracle': [
+        r'ORA-[0-9][0-9][0-9][0-9]'
+    ],
+    'SQLite': [
+        r'SQLite/JDBCDriver',
+        r'SQLITE_ERROR',
+        r'System\.Data\.SQLite\.SQLiteException'
+    ]
+}
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SQL_ERRORS_FILE = os.path.join(DATA_DIR, 'sql_errors.json')
+# مراجع المجموعات المرقمة تتغير أرقامها بعد تغليف النمط في مجموعة مسماة
+NUMBERED_REFERENCE = re.compile(r'(?<!\\)(?:\\\\)*(?:\\[1-9]|\(\?\(\d)')
+
+class SignatureEngine:
+    """محرك تواقيع يجمع كل الأنماط في تعبير نمطي واحد يُطابق بمرور واحد"""
+
+    def __init__(self, signatures=None, flags=re.I):
+        self.flags = flags
+        self.signatures = []
+        self._compiled = None
+        self._lock = threading.Lock()
+        if signatures:
+            self.update(signatures)
+
+    @classmethod
+    def sql_errors(cls, extra_files=None):
+        """إنشاء محرك تواقيع أخطاء SQL الافتراضي"""
+        engine = cls(DEFAULT_SQL_ERROR_SIGNATURES)
+        if os.path.exists(SQL_ERRORS_FILE):
+            engine.load_file(SQL_ERRORS_FILE)
+        for path in extra_files or []:
+            engine.load_file(path)
+        return engine
+
+    def add(self, label, pattern):
+        """إضافة توقيع واحد بعد التحقق من صحته داخل التعبير المدمج
+
+        يُترجم التعبير المدمج فورًا فتظهر الأخطاء عند التحميل لا أثناء المسح.
+        """
+        if NUMBERED_REFERENCE.search(pattern):
+            raise ValueError(
+                f'Invalid signature for {label}: {pattern} '
+                '(numbered group references are not supported, use (?P<name>...) and (?P=name))'
+            )
+        with self._lock:
+            if (label, pattern) in self.signatures:
+                return
+            signatures = self.signatures + [(label, pattern)]
+            try:
+                compiled = re.compile(self._combine(signatures), self.flags)
+            except re.error as e:
+                # الأعلام العامة مثل (?i) لا تصح إلا في بداية التعبير المدمج
+                raise ValueError(f'Invalid signature for {label}: {pattern} ({e})')
+            self.signatures = signatures
+            self._compiled = compiled
+
+    def update(self, signatures):
+        """إضافة تواقيع من قاموس {التصنيف: [الأنماط]}"""
+        for label, patterns in signatures.items():
+            for pattern in patterns:
+                self.add(label, pattern)
+
+    def load_file(self, path):
+        """تحميل تواقيع إضافية من ملف JSON"""
+        with open(path, encoding='utf-8') as f:
+            self.update(json.load(f))
+
+    @staticmethod
+    def _combine(signatures):
+        """دمج التواقيع في تعبير واحد بمجموعات مسماة"""
+        combined = '|'.join(
+            f'(?P<s{index}>{pattern})' for index, (_, pattern) in enumerate(signatures)
+        )
+        return combined or r'(?!)'
+
+    def _compile(self):
+        with self._lock:
+            if self._compiled is None:
+                self._compiled = re.compile(self._combine(self.signatures), self.flags)
+            return self._compiled
+
+    def match(self, text):
+        """إرجاع (التصنيف، النمط) لأول توقيع مطابق أو None"""
+        found = self._compile().search(text)
+        if not found:
+            return None
+        label, pattern = self.signatures[int(found.lastgroup[1:])]
+        return label, pattern
+
+    def __len__(self):
+        return len(self.signatures)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+from datetime import datetime, timezone
+import json
+import threading
+
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+SARIF_LEVELS = {'CRITICAL': 'error', 'HIGH': 'error', 'MEDIUM': 'warning', 'LOW': 'note', 'INFO': 'note'}
+
+class NullSink:
+    """مخرج نتائج لا يكتب شيئًا، يُستخدم عند عدم تحديد ملف مخرجات"""
+
+    def emit(self, finding, scanner=None, target=None):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+class ResultSink:
+    """مخرج نتائج متدفق: كتابة مخزنة مؤقتًا مع تفريغ دوري إلى الملف
+
+    تُكتب النتائج فور اكتشافها، فتبقى النتائج الجزئية على القرص عند
+    انقطاع المسح ويمكن قراءتها أثناء تقدمه. الصيغة الافتراضية JSONL، وتعيد
+    الأصناف الفرعية تعريف header وfooter وrender لصيغ أخرى.
+    """
+
+    def __init__(self, path, flush_interval=1.0, buffer_size=100):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self.count = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._file = open(path, 'w', encoding='utf-8')
+        self._file.write(self.header())
+        self._file.flush()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    def header(self):
+        return ''
+
+    def footer(self):
+        return ''
+
+    def render(self, record, index):
+        """نتيجة واحدة بصيغة JSON في سطر مستقل"""
+        return json.dumps(record, ensure_ascii=False, default=str) + '\n'
+
+    def emit(self, finding, scanner=None, target=None):
+        """إضافة نتيجة إلى المخزن المؤقت وتفريغه عند امتلائه"""
+        record = {
+            'time': datetime.now(timezone.utc).isoformat(),
+            'scanner': scanner,
+            'target': target
+        }
+        record.update(finding)
+        with self._lock:
+            if self._closed.is_set():
+                return
+            self._buffer.append(self.render(record, self.count))
+            self.count += 1
+            full = len(self._buffer) >= self.buffer_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        """كتابة المخزن المؤقت إلى الملف"""
+        with self._lock:
+            if not self._buffer or self._file.closed:
+                return
+            self._file.write(''.join(self._buffer))
+            self._file.flush()
+            self._buffer = []
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        """تفريغ النتائج المتبقية وإغلاق الملف"""
+        with self._lock:
+            if self._closed.is_set():
+                return
+            self._closed.set()
+            self._file.write(''.join(self._buffer) + self.footer())
+            self._buffer = []
+            self._file.close()
+        self._flusher.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+# مخرج JSONL هو المخرج الأساسي بصيغته الافتراضية
+JSONLSink = ResultSink
+
+class SARIFSink(ResultSink):
+    """تقرير SARIF 2.1.0 تُكتب نتائجه تدريجيًا داخل مصفوفة results
+
+    تُغلق المصفوفة والمستند عند close()، لذلك يحتاج الملف المقطوع إلى
+    إكمال القوسين الأخيرين قبل تحليله.
+    """
+
+    def __init__(self, path, tool_version='1.0.0', **kwargs):
+        self.tool_version = tool_version
+        super().__init__(path, **kwargs)
+
+    def header(self):
+        driver = json.dumps({
+            'name': 'Web-Hack',
+            'version': self.tool_version,
+            'informationUri': 'https://github.com/SayerLinux/web-hack'
+        })
+        return (
+            f'{{"version": "2.1.0", "$schema": "{SARIF_SCHEMA}", '
+            f'"runs": [{{"tool": {{"driver": {driver}}}, "results": [\n'
+        )
+
+    def footer(self):
+        return '\n]}]}\n'
+
+    @staticmethod
+    def message(record):
+        """نص وصفي للنتيجة من الحقول المتاحة"""
+        if record.get('description'):
+            return record['description']
+        if 'port' in record:
+            service = record.get('service') or 'unknown'
+            return f"Port {record['port']}/{record.get('protocol', 'tcp')} {record.get('state')}: {service}"
+        if 'status_code' in record:
+            return f"{record.get('url')} ({record['status_code']})"
+        return record.get('type') or 'Result'
+
+    def render(self, record, index):
+        result = {
+            'ruleId': record.get('type') or f"{(record.get('scanner') or 'scan').upper()}_RESULT",
+            'level': SARIF_LEVELS.get(
+                str(record.get('severity') or record.get('risk_level') or '').upper(), 'note'
+            ),
+            'message': {'text': self.message(record)},
+            'properties': record
+        }
+        uri = record.get('url') or record.get('target')
+        if uri:
+            result['locations'] = [{'physicalLocation': {'artifactLocation': {'uri': str(uri)}}}]
+        prefix = ',\n' if index else ''
+        return prefix + json.dumps(result, ensure_ascii=False, default=str)
+
+SINKS = {'jsonl': JSONLSink, 'sarif': SARIFSink}
+
+def open_sink(path, format=None, **kwargs):
+    """فتح مخرج نتائج حسب الصيغة أو امتداد الملف"""
+    if format is None:
+        format = 'sarif' if path.endswith(('.sarif', '.sarif.json')) else 'jsonl'
+    if format not in SINKS:
+        raise ValueError(f'Unknown output format: {format}')
+    return SINKS[format](path, **kwargs)
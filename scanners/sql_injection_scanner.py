@@ -1,14 +1,19 @@
 #!/usr/bin/env python3
 
-import requests
-from bs4 import BeautifulSoup
 from rich.console import Console
-from rich.progress import Progress
-from urllib.parse import urljoin, urlparse, parse_qs
-import re
+
+from .crawler import Crawler
+from .engine import ScanEngine, host_of, progress_bar
+from .fingerprint import BaselineStore, Fingerprint
+from .http_client import HTTPClient
+from .scheduler import PayloadScheduler
+from .signatures import SignatureEngine
+from .sink import NullSink
+from .state import NullState
 
 class SQLInjectionScanner:
-    def __init__(self, target):
+    def __init__(self, target, client=None, engine=None, signature_files=None,
+                 scheduler=None, sink=None, state=None):
         self.target = target
         self.console = Console()
         self.vulnerabilities = []
@@ -16,6 +21,18 @@ class SQLInjectionScanner:
         self.headers = {
             'User-Agent': 'Web-Hack Security Scanner v1.0 (SayerLinux)'
         }
+        self.client = client if client else HTTPClient(headers=self.headers)
+        self.engine = engine if engine else ScanEngine()
+        # شريط تقدم مشترك يمرره المنسق عند تشغيل عدة ماسحات معًا
+        self.progress = None
+        self.sink = sink if sink else NullSink()
+        self.state = state if state else NullState()
+        self.max_urls = 100
+        # الصفحات التي تظهر فيها كل نقطة حقن، لإرفاقها بالنتائج
+        self.shared_pages = {}
+        # حد قراءة الجسم لكل طلب اختبار
+        self.max_body_size = 1024 * 1024
+        self.scheduler = scheduler if scheduler else PayloadScheduler()
         # نماذج SQL Injection للاختبار
         self.sql_payloads = [
             "' OR '1'='1",
@@ -33,18 +50,17 @@ class SQLInjectionScanner:
             "1' ORDER BY 2--",
             "1' ORDER BY 3--"
         ]
-        # أنماط رسائل الخطأ SQL
-        self.error_patterns = [
-            'SQL syntax.*MySQL',
-            'Warning.*mysql_.*',
-            'PostgreSQL.*ERROR',
-            'Driver.*SQL.*Server',
-            'ORA-[0-9][0-9][0-9][0-9]',
-            'Microsoft SQL Native Client.*',
-            'SQLite/JDBCDriver',
-            'SQLITE_ERROR',
-            'System\.Data\.SQLite\.SQLiteException'
-        ]
+        # تواقيع رسائل الخطأ SQL مجمعة في محرك واحد
+        self.signatures = SignatureEngine.sql_errors(signature_files)
+        # خطوط أساس مشتركة لكل نقطة نهاية لمقارنة بصمات الاستجابات
+        self.baselines = BaselineStore()
+
+    def add_finding(self, finding):
+        """تسجيل ثغرة حقن SQL وإرسالها إلى مخرج النتائج فور اكتشافها"""
+        if not self.state.add_finding('sqli', self.target, finding):
+            return
+        self.vulnerabilities.append(finding)
+        self.sink.emit(finding, scanner='sqli', target=self.target)
 
     def normalize_url(self, url):
         """تطبيع عنوان URL"""
@@ -52,154 +68,192 @@ class SQLInjectionScanner:
             url = f'http://{url}'
         return url
 
-    def is_same_domain(self, url):
-        """التحقق مما إذا كان URL من نفس النطاق"""
-        return urlparse(url).netloc == urlparse(self.target).netloc
-
     def has_sql_error(self, response_text):
-        """التحقق من وجود رسائل خطأ SQL"""
-        for pattern in self.error_patterns:
-            if re.search(pattern, response_text, re.I):
-                return True
-        return False
+        """التحقق من وجود رسائل خطأ SQL وإرجاع نوع قاعدة البيانات"""
+        matched = self.signatures.match(response_text)
+        return matched[0] if matched else None
+
+    def send(self, url, method, data, until=None):
+        """إرسال طلب الاختبار بالطريقة المناسبة ضمن ميزانية الطلبات"""
+        if not self.scheduler.acquire():
+            return None
+        if method.lower() == 'post':
+            return self.client.post(
+                url,
+                data=data,
+                allow_redirects=False,
+                max_bytes=self.max_body_size,
+                until=until
+            )
+        return self.client.get(
+            url,
+            params=data,
+            allow_redirects=False,
+            max_bytes=self.max_body_size,
+            until=until
+        )
 
-    def test_parameter(self, url, param, value, method='get'):
+    def get_baseline(self, url, param, value, method, base_data):
+        """جلب خط الأساس لنقطة النهاية بقيمها الأصلية مرة واحدة"""
+        data = dict(base_data or {})
+        data[param] = value
+        key = (method.lower(), url, tuple(sorted(data.items())))
+        return self.baselines.get(key, lambda: self.send(url, method, data))
+
+    def probe_canary(self, url, param, value, method, base_data, baseline):
+        """مسبار تمهيدي: هل يسبب رمز خاص خطأ SQL أو تغييرًا في الاستجابة؟"""
+        _, canary = self.scheduler.make_canary()
+        test_data = dict(base_data or {})
+        test_data[param] = value + canary
+        # التنزيل يتوقف فور ظهور رسالة خطأ SQL
+        response = self.send(url, method, test_data, until=self.has_sql_error)
+        if response is None:
+            return False
+        if self.has_sql_error(response.text):
+            return True
+        reflected = ((test_data[param], value),)
+        return baseline.differs(Fingerprint.from_response(response, reflected))
+
+    def test_parameter(self, url, param, value, method='get', base_data=None):
         """اختبار معامل واحد"""
-        for payload in self.sql_payloads:
+        if self.scheduler.exhausted():
+            return False
+        # مفتاح المجس في حالة المسح: القيمة الأصلية جزء منه لأن الصفحات قد تختلف فيها
+        endpoint, parameter = f'{method.upper()} {url}', f'{param}={value}'
+        if self.state.probe_done('sqli', endpoint, parameter):
+            return False
+
+        try:
+            baseline = self.get_baseline(url, param, value, method, base_data)
+            if baseline is None:
+                return False
+
+            # تصعيد المعاملات التي تستجيب للمسبار التمهيدي فقط
+            if self.scheduler.canary and not self.probe_canary(
+                    url, param, value, method, base_data, baseline):
+                self.scheduler.skip()
+                self.state.mark_probe('sqli', endpoint, parameter)
+                return False
+        except Exception as e:
+            self.console.print(f'[red]Error testing parameter {param}: {str(e)}[/red]')
+            return False
+
+        for payload in self.scheduler.schedule(self.sql_payloads):
+            if self.state.probe_done('sqli', endpoint, parameter, payload):
+                continue
             try:
-                test_data = {param: value + payload}
-                
-                if method.lower() == 'post':
-                    response = requests.post(
-                        url,
-                        data=test_data,
-                        headers=self.headers,
-                        allow_redirects=False
-                    )
-                else:
-                    response = requests.get(
-                        url,
-                        params=test_data,
-                        headers=self.headers,
-                        allow_redirects=False
-                    )
+                test_data = dict(base_data or {})
+                test_data[param] = value + payload
+                response = self.send(url, method, test_data, until=self.has_sql_error)
+                if response is None:
+                    return False
 
                 # التحقق من مؤشرات SQL Injection
-                if self.has_sql_error(response.text):
-                    self.vulnerabilities.append({
+                dbms = self.has_sql_error(response.text)
+                if dbms:
+                    self.add_finding({
                         'type': 'SQL_INJECTION',
                         'url': url,
                         'method': method,
                         'parameter': param,
                         'payload': payload,
-                        'evidence': 'SQL Error Message Detected'
+                        'evidence': 'SQL Error Message Detected',
+                        'dbms': dbms,
+                        'pages': self.shared_pages.get((method.lower(), url), [])
                     })
+                    self.state.mark_probe('sqli', endpoint, parameter)
                     return True
 
-                # التحقق من التغييرات في طول الاستجابة
-                original_length = len(response.text)
+                # مقارنة البصمة بخط الأساس دون طلب إضافي ما لم تختلف
+                reflected = ((test_data[param], value),)
+                fingerprint = Fingerprint.from_response(response, reflected)
+                if not baseline.differs(fingerprint):
+                    self.state.mark_probe('sqli', endpoint, parameter, payload)
+                    continue
+
+                # التأكيد بشرط خاطئ: يجب أن تختلف الاستجابتان أيضًا
                 test_data[param] = value + payload + " AND '1'='2"
-                
-                if method.lower() == 'post':
-                    modified_response = requests.post(
-                        url,
-                        data=test_data,
-                        headers=self.headers,
-                        allow_redirects=False
-                    )
-                else:
-                    modified_response = requests.get(
-                        url,
-                        params=test_data,
-                        headers=self.headers,
-                        allow_redirects=False
-                    )
-
-                if abs(len(modified_response.text) - original_length) > 50:
-                    self.vulnerabilities.append({
+                modified_response = self.send(url, method, test_data)
+                if modified_response is None:
+                    return False
+                reflected = ((test_data[param], value),)
+                modified = Fingerprint.from_response(modified_response, reflected)
+
+                if modified.distance(fingerprint) > baseline.tolerance:
+                    self.add_finding({
                         'type': 'SQL_INJECTION',
                         'url': url,
                         'method': method,
                         'parameter': param,
                         'payload': payload,
-                        'evidence': 'Response Length Change'
+                        'evidence': 'Response Differs From Baseline',
+                        'pages': self.shared_pages.get((method.lower(), url), [])
                     })
+                    self.state.mark_probe('sqli', endpoint, parameter)
                     return True
+                self.state.mark_probe('sqli', endpoint, parameter, payload)
 
             except Exception as e:
                 self.console.print(f'[red]Error testing parameter {param}: {str(e)}[/red]')
 
+        self.state.mark_probe('sqli', endpoint, parameter)
         return False
 
-    def scan_url(self, url):
-        """فحص URL واحد"""
-        if url in self.visited_urls:
-            return
+    def injection_points(self, site_map):
+        """تجميع نقاط الحقن الفريدة من معاملات GET وحقول النماذج"""
+        probes = []
+        for endpoint in site_map.parameters + site_map.forms:
+            pages = self.shared_pages.setdefault((endpoint['method'].lower(), endpoint['url']), [])
+            pages.extend(page for page in endpoint.get('pages', [endpoint['page']]) if page not in pages)
 
-        self.visited_urls.add(url)
+        # معاملات GET في عناوين الصفحات
+        for entry in site_map.parameters:
+            for param, value in entry['params'].items():
+                probes.append((entry['url'], param, value, 'get', entry['params']))
 
-        try:
-            # فحص معلمات GET
-            parsed_url = urlparse(url)
-            params = parse_qs(parsed_url.query)
-            
-            for param, values in params.items():
-                if values:
-                    self.test_parameter(url, param, values[0], 'get')
-
-            # فحص النماذج للعثور على نقاط POST
-            response = requests.get(url, headers=self.headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            forms = soup.find_all('form')
-
-            for form in forms:
-                action = form.get('action', '')
-                method = form.get('method', 'get').lower()
-                form_url = urljoin(url, action)
-                
-                inputs = form.find_all(['input', 'textarea'])
-                for input_field in inputs:
-                    input_name = input_field.get('name')
-                    if input_name:
-                        self.test_parameter(form_url, input_name, '', method)
+        # حقول النماذج
+        for form in site_map.forms:
+            form_data = {field['name']: field['value'] for field in form['inputs']}
+            for input_field in form['inputs']:
+                probes.append((form['url'], input_field['name'], '', form['method'], form_data))
 
-        except Exception as e:
-            self.console.print(f'[red]Error scanning URL {url}: {str(e)}[/red]')
+        return probes
 
-    def crawl_and_scan(self, url, max_urls=10):
-        """تصفح الموقع وفحص الصفحات"""
-        try:
-            response = requests.get(url, headers=self.headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            links = soup.find_all('a')
-            for link in links:
-                href = link.get('href')
-                if href and not href.startswith('#'):
-                    absolute_url = urljoin(url, href)
-                    if self.is_same_domain(absolute_url) and len(self.visited_urls) < max_urls:
-                        self.scan_url(absolute_url)
+    async def crawl(self):
+        """بناء خريطة الموقع عند عدم تمريرها من الخارج"""
+        crawler = Crawler(
+            self.target, client=self.client, engine=self.engine, max_pages=self.max_urls
+        )
+        return await crawler.crawl_async()
 
-        except Exception as e:
-            self.console.print(f'[red]Error crawling {url}: {str(e)}[/red]')
+    async def scan_async(self, site_map=None):
+        """تنفيذ المسح الكامل بشكل غير متزامن"""
+        with progress_bar(self.progress) as progress:
+            if site_map is None:
+                crawl_task = progress.add_task('[cyan]Crawling target...', total=1)
+                site_map = await self.crawl()
+                progress.update(crawl_task, advance=1)
 
-    def scan(self):
-        """تنفيذ المسح الكامل"""
-        url = self.normalize_url(self.target)
-        
-        with Progress() as progress:
-            task = progress.add_task('[cyan]Scanning for SQL Injection vulnerabilities...', total=100)
-            
-            # فحص الصفحة الرئيسية
-            self.scan_url(url)
-            progress.update(task, advance=50)
-            
-            # تصفح وفحص الصفحات الأخرى
-            self.crawl_and_scan(url)
-            progress.update(task, advance=50)
+            self.visited_urls.update(site_map.pages)
+            probes = self.injection_points(site_map)
+
+            task = progress.add_task(
+                '[cyan]Scanning for SQL Injection vulnerabilities...', total=len(probes)
+            )
+
+            async def run_probe(probe):
+                await self.engine.submit(host_of(probe[0]), self.test_parameter, *probe)
+                progress.update(task, advance=1)
+
+            # اختبار المعاملات المستقلة بالتوازي
+            await self.engine.gather(run_probe(probe) for probe in probes)
 
         return self.vulnerabilities
 
+    def scan(self, site_map=None):
+        """تنفيذ المسح الكامل"""
+        return self.engine.run(self.scan_async(site_map))
+
     def generate_report(self):
         """إنشاء تقرير بنتائج المسح"""
         self.console.print('\n[bold green]===== SQL Injection Scan Report =====[/bold green]')
@@ -216,4 +270,8 @@ class SQLInjectionScanner:
             self.console.print(f'Method: {vuln["method"].upper()}')
             self.console.print(f'Parameter: {vuln["parameter"]}')
             self.console.print(f'Payload: {vuln["payload"]}')
+            if vuln.get('dbms'):
+                self.console.print(f'DBMS: {vuln["dbms"]}')
+            if len(vuln.get('pages', [])) > 1:
+                self.console.print(f'Found on {len(vuln["pages"])} pages: {", ".join(vuln["pages"][:5])}')
             self.console.print(f'Evidence: {vuln["evidence"]}\n')
\ No newline at end of file
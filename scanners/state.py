@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+
+from datetime import datetime, timezone
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+
+DEFAULT_STATE_PATH = os.path.join(os.path.expanduser('~'), '.web-hack', 'state.db')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS scans (
+    id TEXT PRIMARY KEY,
+    target TEXT NOT NULL,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created TEXT NOT NULL,
+    updated TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stages (
+    scan_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (scan_id, name)
+);
+CREATE TABLE IF NOT EXISTS frontier (
+    scan_id TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    url TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    page TEXT,
+    PRIMARY KEY (scan_id, scope, url)
+);
+CREATE TABLE IF NOT EXISTS probes (
+    scan_id TEXT NOT NULL,
+    scanner TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    parameter TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (scan_id, scanner, endpoint, parameter, payload)
+);
+CREATE TABLE IF NOT EXISTS offsets (
+    scan_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (scan_id, name)
+);
+CREATE TABLE IF NOT EXISTS page_index (
+    scope TEXT NOT NULL,
+    url TEXT NOT NULL,
+    scan_id TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    body_hash TEXT,
+    inventory_hash TEXT,
+    page TEXT NOT NULL,
+    PRIMARY KEY (scope, url, scan_id)
+);
+CREATE TABLE IF NOT EXISTS findings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scan_id TEXT NOT NULL,
+    scanner TEXT NOT NULL,
+    target TEXT NOT NULL,
+    data TEXT NOT NULL,
+    UNIQUE (scan_id, scanner, target, data)
+);
+'''
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+class NullState:
+    """حالة مسح غير دائمة: لا شيء يُحفظ ولا شيء يُتخطى"""
+
+    scan_id = None
+
+    def probe_done(self, scanner, endpoint, parameter, payload='*'):
+        return False
+
+    def mark_probe(self, scanner, endpoint, parameter, payload='*'):
+        pass
+
+    def add_finding(self, scanner, target, finding):
+        return True
+
+    def findings(self, scanner, target):
+        return []
+
+    def previous_findings(self, scanner, target):
+        return []
+
+    def add_frontier(self, scope, urls, depth):
+        pass
+
+    def complete_page(self, scope, url, depth, page):
+        pass
+
+    def frontier(self, scope):
+        return [], []
+
+    def get_offset(self, name, default=0):
+        return default
+
+    def set_offset(self, name, offset):
+        pass
+
+    def set_stage(self, name, status):
+        pass
+
+    def page_index(self, scope):
+        return {}
+
+    def save_page(self, scope, url, record):
+        pass
+
+    def stage_done(self, name):
+        return False
+
+class ScanState(NullState):
+    """مخزن حالة المسح في SQLite بنمط WAL لاستئناف المسح بعد انقطاعه
+
+    يسجل قائمة الزحف، والمجسات المكتملة (نقطة النهاية، المعامل، الحمولة)،
+    وإزاحات قوائم الكلمات، والنتائج. تُجمع الكتابات في معاملة واحدة تُثبت
+    كل commit_interval ثانية، فقد يُعاد عند الاستئناف عمل ثانية واحدة فقط.
+    """
+
+    def __init__(self, scan_id, path=DEFAULT_STATE_PATH, commit_interval=1.0):
+        self.scan_id = scan_id
+        self.path = path
+        self.commit_interval = commit_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._committed = time.monotonic()
+
+        row = self._db.execute(
+            'SELECT target, options, status FROM scans WHERE id = ?', (scan_id,)
+        ).fetchone()
+        self.target, options, self.status = row if row else (None, '{}', None)
+        self.options = json.loads(options)
+        # المجسات المكتملة في الذاكرة لأن التحقق منها يسبق كل طلب
+        self._probes = {
+            tuple(probe) for probe in self._db.execute(
+                'SELECT scanner, endpoint, parameter, payload FROM probes WHERE scan_id = ?',
+                (scan_id,)
+            )
+        }
+
+    @classmethod
+    def create(cls, target, options, path=DEFAULT_STATE_PATH):
+        """إنشاء مسح جديد بمعرف فريد"""
+        scan_id = f'{datetime.now():%Y%m%d-%H%M%S}-{secrets.token_hex(3)}'
+        state = cls(scan_id, path)
+        with state._lock:
+            state._db.execute(
+                'INSERT INTO scans (id, target, options, status, created, updated) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (scan_id, target, json.dumps(options), 'running', _now(), _now())
+            )
+            state._db.commit()
+        state.target, state.options, state.status = target, options, 'running'
+        return state
+
+    @classmethod
+    def resume(cls, scan_id, path=DEFAULT_STATE_PATH):
+        """فتح مسح سابق للاستئناف"""
+        if not os.path.exists(path):
+            raise ValueError(f'No scan state found at {path}')
+        state = cls(scan_id, path)
+        if state.target is None:
+            state.close()
+            raise ValueError(f'Unknown scan id: {scan_id}')
+        return state
+
+    def _write(self, sql, params=(), many=False):
+        """تنفيذ كتابة مع تثبيت المعاملة على فترات"""
+        with self._lock:
+            cursor = self._db.executemany(sql, params) if many else self._db.execute(sql, params)
+            if time.monotonic() - self._committed >= self.commit_interval:
+                self._db.commit()
+                self._committed = time.monotonic()
+            return cursor
+
+    def _read(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def probe_done(self, scanner, endpoint, parameter, payload='*'):
+        """التحقق من اكتمال مجس سابقًا، و'*' تعني اكتمال المعامل كله"""
+        return (scanner, endpoint, parameter, payload) in self._probes
+
+    def mark_probe(self, scanner, endpoint, parameter, payload='*'):
+        """تسجيل اكتمال مجس"""
+        probe = (scanner, endpoint, parameter, payload)
+        if probe in self._probes:
+            return
+        self._probes.add(probe)
+        self._write('INSERT OR IGNORE INTO probes VALUES (?, ?, ?, ?, ?)', (self.scan_id,) + probe)
+
+    def add_finding(self, scanner, target, finding):
+        """حفظ نتيجة، وإرجاع False إن كانت مسجلة من قبل"""
+        data = json.dumps(finding, sort_keys=True, default=str)
+        cursor = self._write(
+            'INSERT OR IGNORE INTO findings (scan_id, scanner, target, data) VALUES (?, ?, ?, ?)',
+            (self.scan_id, scanner, target, data)
+        )
+        return cursor.rowcount > 0
+
+    def findings(self, scanner, target):
+        """النتائج المحفوظة لماسح وهدف بترتيب اكتشافها"""
+        rows = self._read(
+            'SELECT data FROM findings WHERE scan_id = ? AND scanner = ? AND target = ? ORDER BY id',
+            (self.scan_id, scanner, target)
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def previous_findings(self, scanner, target):
+        """نتائج آخر مسح مكتمل للهدف نفسه"""
+        rows = self._read(
+            'SELECT id FROM scans WHERE target = ? AND status = ? AND id != ? '
+            'ORDER BY updated DESC LIMIT 1',
+            (self.target, 'completed', self.scan_id)
+        )
+        if not rows:
+            return []
+        rows = self._read(
+            'SELECT data FROM findings WHERE scan_id = ? AND scanner = ? AND target = ? ORDER BY id',
+            (rows[0][0], scanner, target)
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def add_frontier(self, scope, urls, depth):
+        """تسجيل عناوين حُجزت في قائمة الزحف ولم تُجلب بعد"""
+        self._write(
+            'INSERT OR IGNORE INTO frontier (scan_id, scope, url, depth) VALUES (?, ?, ?, ?)',
+            [(self.scan_id, scope, url, depth) for url in urls], many=True
+        )
+
+    def complete_page(self, scope, url, depth, page):
+        """تسجيل صفحة تم جلبها مع محتوياتها"""
+        self._write(
+            'INSERT INTO frontier (scan_id, scope, url, depth, page) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT (scan_id, scope, url) DO UPDATE SET page = excluded.page',
+            (self.scan_id, scope, url, depth, json.dumps(page))
+        )
+
+    def frontier(self, scope):
+        """إرجاع الصفحات المكتملة [(url, depth, page)] والمنتظرة [(url, depth)]"""
+        done, pending = [], []
+        for url, depth, page in self._read(
+                'SELECT url, depth, page FROM frontier WHERE scan_id = ? AND scope = ? ORDER BY rowid',
+                (self.scan_id, scope)):
+            if page is None:
+                pending.append((url, depth))
+            else:
+                done.append((url, depth, json.loads(page)))
+        return done, pending
+
+    def get_offset(self, name, default=0):
+        rows = self._read(
+            'SELECT position FROM offsets WHERE scan_id = ? AND name = ?', (self.scan_id, name)
+        )
+        return rows[0][0] if rows else default
+
+    def set_offset(self, name, offset):
+        """حفظ آخر إزاحة اكتملت جميع المسارات قبلها"""
+        self._write(
+            'INSERT OR REPLACE INTO offsets VALUES (?, ?, ?)', (self.scan_id, name, offset)
+        )
+
+    def set_stage(self, name, status):
+        """تسجيل حالة مرحلة مع تثبيت فوري لكل ما سبقها"""
+        self._write(
+            'INSERT OR REPLACE INTO stages VALUES (?, ?, ?)', (self.scan_id, name, status)
+        )
+        self.commit()
+
+    def stage_done(self, name):
+        rows = self._read(
+            'SELECT status FROM stages WHERE scan_id = ? AND name = ?', (self.scan_id, name)
+        )
+        return bool(rows) and rows[0][0] == 'done'
+
+    def page_index(self, scope):
+        """فهرس الصفحات من آخر مسح مكتمل للنطاق: المصادقات وبصمات المحتوى
+
+        تُستبعد المسوح المنقطعة لأن صفحاتها ربما لم تُختبر بعد.
+        """
+        rows = self._read(
+            'SELECT p.url, p.etag, p.last_modified, p.body_hash, p.inventory_hash, p.page '
+            'FROM page_index p JOIN scans s ON s.id = p.scan_id '
+            'WHERE p.scope = ? AND s.status = ? AND p.scan_id != ? ORDER BY s.updated',
+            (scope, 'completed', self.scan_id)
+        )
+        index = {}
+        for url, etag, last_modified, body_hash, inventory_hash, page in rows:
+            index[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'body_hash': body_hash,
+                'inventory_hash': inventory_hash,
+                'page': json.loads(page)
+            }
+        return index
+
+    def save_page(self, scope, url, record):
+        """حفظ مصادقات الصفحة وبصماتها لاستخدامها في المسح التزايدي التالي"""
+        self._write(
+            'INSERT OR REPLACE INTO page_index VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (scope, url, self.scan_id, record.get('etag'), record.get('last_modified'),
+             record.get('body_hash'), record.get('inventory_hash'), json.dumps(record['page']))
+        )
+
+    def finish(self, status):
+        """تسجيل الحالة النهائية للمسح"""
+        self.status = status
+        self._write(
+            'UPDATE scans SET status = ?, updated = ? WHERE id = ?', (status, _now(), self.scan_id)
+        )
+        if status == 'completed':
+            # فهرس هذا المسح يحل محل فهارس المسوح السابقة للصفحات نفسها
+            self._write(
+                'DELETE FROM page_index WHERE scan_id != ? AND EXISTS ('
+                'SELECT 1 FROM page_index current WHERE current.scan_id = ? '
+                'AND current.scope = page_index.scope AND current.url = page_index.url)',
+                (self.scan_id, self.scan_id)
+            )
+
+    def commit(self):
+        with self._lock:
+            self._db.commit()
+            self._committed = time.monotonic()
+
+    def close(self):
+        """تثبيت الكتابات المتبقية وإغلاق قاعدة البيانات"""
+        with self._lock:
+            self._db.commit()
+            self._db.close()
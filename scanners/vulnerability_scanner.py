@@ -1,15 +1,20 @@
 #!/usr/bin/env python3
 
 import requests
-from bs4 import BeautifulSoup
 from rich.console import Console
-from rich.progress import Progress
 from datetime import datetime
 import sys
 import re
+import threading
+
+from .engine import ScanEngine, host_of, progress_bar
+from .http_client import HTTPClient
+from .response_cache import ResponseCache
+from .sink import NullSink
+from .state import NullState
 
 class VulnerabilityScanner:
-    def __init__(self, target, port=None):
+    def __init__(self, target, port=None, client=None, cache=None, engine=None, sink=None, state=None):
         self.target = target
         self.port = port
         self.console = Console()
@@ -17,6 +22,29 @@ class VulnerabilityScanner:
         self.headers = {
             'User-Agent': 'Web-Hack Security Scanner v1.0 (SayerLinux)'
         }
+        self.client = client if client else HTTPClient(headers=self.headers)
+        # ذاكرة مؤقتة لكي تُجلب الصفحة مرة واحدة لجميع الفحوصات
+        self.cache = cache if cache else ResponseCache()
+        # فحوصات الصفحة الرئيسية لا تحتاج أكثر من أول 2MB
+        self.max_body_size = 2 * 1024 * 1024
+        self.engine = engine if engine else ScanEngine()
+        # شريط تقدم مشترك يمرره المنسق عند تشغيل عدة ماسحات معًا
+        self.progress = None
+        self.sink = sink if sink else NullSink()
+        self.state = state if state else NullState()
+        # يضبطه المنسق عند انتهاء المهلة فتتوقف الفحوصات المتبقية
+        self.stop_event = threading.Event()
+
+    def stop(self):
+        """إيقاف المسح قبل الفحص التالي"""
+        self.stop_event.set()
+
+    def add_finding(self, finding):
+        """تسجيل ثغرة وإرسالها إلى مخرج النتائج"""
+        if not self.state.add_finding('vulnerability', self.target, finding):
+            return
+        self.vulnerabilities.append(finding)
+        self.sink.emit(finding, scanner='vulnerability', target=self.target)
 
     def normalize_url(self, url):
         """تطبيع عنوان URL للفحص"""
@@ -29,10 +57,10 @@ class VulnerabilityScanner:
     def check_ssl(self, url):
         """فحص شهادة SSL"""
         try:
-            response = requests.get(url, headers=self.headers, verify=True)
+            self.cache.fetch_response(self.client, url, verify=True, max_bytes=self.max_body_size)
             return True
         except requests.exceptions.SSLError:
-            self.vulnerabilities.append({
+            self.add_finding({
                 'type': 'SSL_VULNERABILITY',
                 'severity': 'HIGH',
                 'description': 'Invalid SSL certificate or SSL misconfiguration detected'
@@ -45,7 +73,7 @@ class VulnerabilityScanner:
     def check_headers(self, url):
         """فحص رؤوس HTTP الأمنية"""
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.cache.fetch_response(self.client, url, max_bytes=self.max_body_size)
             headers = response.headers
 
             security_headers = {
@@ -57,7 +85,7 @@ class VulnerabilityScanner:
 
             for header, message in security_headers.items():
                 if header not in headers:
-                    self.vulnerabilities.append({
+                    self.add_finding({
                         'type': 'SECURITY_HEADER_MISSING',
                         'severity': 'MEDIUM',
                         'description': message
@@ -68,14 +96,19 @@ class VulnerabilityScanner:
 
     def check_information_disclosure(self, url):
         """فحص تسريب المعلومات"""
+        # bs4 ثقيل الاستيراد ولا تحتاجه فحوصات الترويسات
+        from bs4 import BeautifulSoup
+
         try:
-            response = requests.get(url, headers=self.headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            response, soup = self.cache.fetch_parsed(
+                self.client, url, lambda text: BeautifulSoup(text, 'html.parser'),
+                max_bytes=self.max_body_size
+            )
 
             # البحث عن تعليقات HTML
             comments = soup.find_all(string=lambda text: isinstance(text, str) and '-->' in text)
             if comments:
-                self.vulnerabilities.append({
+                self.add_finding({
                     'type': 'INFORMATION_DISCLOSURE',
                     'severity': 'LOW',
                     'description': 'HTML comments found that might reveal sensitive information'
@@ -83,4 +116,57 @@ class VulnerabilityScanner:
 
             # البحث عن إصدارات البرامج
             version_patterns = [
-                r'version\s*[:\=]\s*[\\'\
\ No newline at end of file
+                r'version\s*[:\=]\s*[\'"]?([0-9][0-9.]*)',
+                r'(?:Apache|nginx|PHP|IIS)/([0-9][0-9.]*)',
+                r'<meta[^>]+name=[\'"]generator[\'"][^>]+content=[\'"]([^\'"]+)'
+            ]
+            sources = [response.text] + [
+                f'{name}: {value}' for name, value in response.headers.items()
+                if name.lower() in ('server', 'x-powered-by', 'x-aspnet-version')
+            ]
+            for pattern in version_patterns:
+                if any(re.search(pattern, source, re.I) for source in sources):
+                    self.add_finding({
+                        'type': 'INFORMATION_DISCLOSURE',
+                        'severity': 'LOW',
+                        'description': 'Software version information disclosed'
+                    })
+                    break
+
+        except Exception as e:
+            self.console.print(f'[red]Error checking information disclosure: {str(e)}[/red]')
+
+    def scan(self):
+        """تنفيذ المسح الكامل"""
+        url = self.normalize_url(self.target)
+
+        with progress_bar(self.progress) as progress:
+            task = progress.add_task('[cyan]Scanning for common vulnerabilities...', total=3)
+
+            for check in (self.check_ssl, self.check_headers, self.check_information_disclosure):
+                if self.stop_event.is_set():
+                    break
+                check(url)
+                progress.update(task, advance=1)
+
+        return self.vulnerabilities
+
+    async def scan_async(self):
+        """تنفيذ المسح الكامل بشكل غير متزامن"""
+        return await self.engine.submit(host_of(self.normalize_url(self.target)), self.scan)
+
+    def generate_report(self):
+        """إنشاء تقرير بنتائج المسح"""
+        self.console.print('\n[bold green]===== Vulnerability Scan Report =====[/bold green]')
+        self.console.print(f'Target: {self.target}')
+        self.console.print(f'Scan time: {datetime.now()}\n')
+
+        if not self.vulnerabilities:
+            self.console.print('[green]No vulnerabilities found![/green]')
+            return
+
+        severity_colors = {'HIGH': 'red', 'MEDIUM': 'yellow', 'LOW': 'blue'}
+        for vuln in self.vulnerabilities:
+            color = severity_colors.get(vuln['severity'], 'white')
+            self.console.print(f'[{color}][{vuln["severity"]}] {vuln["type"]}[/{color}]')
+            self.console.print(f'Description: {vuln["description"]}\n')
\ No newline at end of file
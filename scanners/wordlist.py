@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+from collections import OrderedDict
+import os
+import threading
+
+class Wordlist:
+    """قائمة كلمات متدفقة تُقرأ سطرًا بسطر دون تحميلها كاملة في الذاكرة"""
+
+    def __init__(self, source, extensions=None, start_offset=0):
+        self.source = source
+        self.extensions = [ext if ext.startswith('.') else f'.{ext}' for ext in extensions or []]
+        self.start_offset = start_offset
+
+    @property
+    def is_file(self):
+        return isinstance(self.source, (str, os.PathLike))
+
+    def size(self):
+        """الحجم الكلي بوحدة الإزاحة: بايتات للملف وعدد العناصر للقائمة"""
+        if self.is_file:
+            return os.path.getsize(self.source)
+        try:
+            return len(self.source)
+        except TypeError:
+            return None
+
+    def expand(self, word):
+        """توليد المسار مع لواحقه عند الطلب"""
+        yield word
+        if word.endswith('/'):
+            return
+        for ext in self.extensions:
+            if not word.endswith(ext):
+                yield word + ext
+
+    def _lines(self):
+        """قراءة الأسطر مع إزاحة السطر التالي لاستخدامها في الاستئناف"""
+        if self.is_file:
+            with open(self.source, 'rb') as f:
+                f.seek(self.start_offset)
+                offset = self.start_offset
+                for raw in f:
+                    offset += len(raw)
+                    yield offset, raw.decode('utf-8', 'replace')
+        else:
+            for index, word in enumerate(self.source):
+                if index >= self.start_offset:
+                    yield index + 1, word
+
+    def groups(self):
+        """إرجاع أزواج (الإزاحة، مسارات السطر بعد التوسيع) بشكل كسول"""
+        for offset, line in self._lines():
+            word = line.strip().lstrip('/')
+            if not word or word.startswith('#'):
+                continue
+            yield offset, list(self.expand(word))
+
+    def __iter__(self):
+        """إرجاع أزواج (الإزاحة، المسار) بشكل كسول"""
+        for offset, paths in self.groups():
+            for path in paths:
+                yield offset, path
+
+class OffsetTracker:
+    """تتبع أعلى إزاحة اكتملت جميع المسارات قبلها لاستئناف المسح"""
+
+    def __init__(self, start_offset=0):
+        self.completed_offset = start_offset
+        self._pending = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, offset, count=1):
+        """تسجيل مسارات سطر كامل قيد التنفيذ"""
+        with self._lock:
+            self._pending[offset] = self._pending.get(offset, 0) + count
+
+    def done(self, offset):
+        """تسجيل اكتمال مسار وتقديم إزاحة الاستئناف"""
+        with self._lock:
+            self._pending[offset] -= 1
+            while self._pending:
+                first, count = next(iter(self._pending.items()))
+                if count:
+                    break
+                self._pending.popitem(last=False)
+                self.completed_offset = first
+            return self.completed_offset
@@ -1,14 +1,17 @@
 #!/usr/bin/env python3
 
-import requests
-from bs4 import BeautifulSoup
 from rich.console import Console
-from rich.progress import Progress
-from urllib.parse import urljoin, urlparse
 import re
 
+from .crawler import Crawler
+from .engine import ScanEngine, host_of, progress_bar
+from .http_client import HTTPClient
+from .scheduler import PayloadScheduler
+from .sink import NullSink
+from .state import NullState
+
 class XSSScanner:
-    def __init__(self, target):
+    def __init__(self, target, client=None, engine=None, scheduler=None, sink=None, state=None):
         self.target = target
         self.console = Console()
         self.vulnerabilities = []
@@ -17,6 +20,18 @@ class XSSScanner:
         self.headers = {
             'User-Agent': 'Web-Hack Security Scanner v1.0 (SayerLinux)'
         }
+        self.client = client if client else HTTPClient(headers=self.headers)
+        self.engine = engine if engine else ScanEngine()
+        # شريط تقدم مشترك يمرره المنسق عند تشغيل عدة ماسحات معًا
+        self.progress = None
+        self.sink = sink if sink else NullSink()
+        self.state = state if state else NullState()
+        self.max_urls = 100
+        # الصفحات التي يتكرر فيها كل نموذج، لإرفاقها بالنتائج
+        self.shared_pages = {}
+        # يكفي للبحث عن الانعكاس جزء محدود من الجسم
+        self.max_body_size = 1024 * 1024
+        self.scheduler = scheduler if scheduler else PayloadScheduler()
         # نماذج XSS للاختبار
         self.xss_payloads = [
             '<script>alert(1)</script>',
@@ -29,6 +44,25 @@ class XSSScanner:
             '"onmouseover=alert(1)',
             'javascript:alert(1)'
         ]
+        # الحمولات المناسبة لكل سياق انعكاس؛ السياقات الأخرى تجرب القائمة كاملة
+        self.context_payloads = {
+            'html': ['<script>alert(1)</script>', '<img src=x onerror=alert(1)>', '<svg/onload=alert(1)>'],
+            'attr-double': [
+                '"><script>alert(1)</script>', '"><img src=x onerror=alert(1)>', '"onmouseover=alert(1)'
+            ],
+            'attr-single': ['\'><script>alert(1)</script>', '\'><img src=x onerror=alert(1)>'],
+            'attr-unquoted': ['"><script>alert(1)</script>', '"><img src=x onerror=alert(1)>'],
+            'url': ['javascript:alert(1)', '"><script>alert(1)</script>', '\'><script>alert(1)</script>']
+        }
+        # مسبار واحد لجميع حقول النموذج بدل مسبار لكل حقل
+        self.pack_fields = True
+
+    def add_finding(self, finding):
+        """تسجيل ثغرة XSS وكتابتها إلى مخرج النتائج"""
+        if not self.state.add_finding('xss', self.target, finding):
+            return
+        self.vulnerabilities.append(finding)
+        self.sink.emit(finding, scanner='xss', target=self.target)
 
     def normalize_url(self, url):
         """تطبيع عنوان URL"""
@@ -36,118 +70,200 @@ class XSSScanner:
             url = f'http://{url}'
         return url
 
-    def is_same_domain(self, url):
-        """التحقق مما إذا كان URL من نفس النطاق"""
-        return urlparse(url).netloc == urlparse(self.target).netloc
-
-    def extract_forms(self, url):
-        """استخراج النماذج من الصفحة"""
-        try:
-            response = requests.get(url, headers=self.headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            return soup.find_all('form')
-        except Exception as e:
-            self.console.print(f'[red]Error extracting forms from {url}: {str(e)}[/red]')
-            return []
-
-    def test_xss_in_form(self, form, url):
-        """اختبار XSS في النموذج"""
-        action = form.get('action', '')
-        method = form.get('method', 'get').lower()
-        inputs = form.find_all(['input', 'textarea'])
+    def send(self, form_url, method, data, until=None):
+        """إرسال طلب الاختبار ضمن ميزانية الطلبات، والتوقف عن القراءة عند ظهور until"""
+        if not self.scheduler.acquire():
+            return None
+        if method == 'post':
+            return self.client.post(
+                form_url,
+                data=data,
+                allow_redirects=False,
+                max_bytes=self.max_body_size,
+                until=until
+            )
+        return self.client.get(
+            form_url,
+            params=data,
+            allow_redirects=False,
+            max_bytes=self.max_body_size,
+            until=until
+        )
+
+    def probe_canary(self, form_url, method, form_data, input_name):
+        """إرسال مسبار تمهيدي لحقل واحد وإرجاع (الرموز الناجية، السياقات) أو None"""
+        found = self.probe_fields(form_url, method, form_data, [input_name], allow_errors=True)
+        return (found or {}).get(input_name)
+
+    def probe_fields(self, form_url, method, form_data, fields, allow_errors=False):
+        """مسبار مجمّع: رمز فريد في كل حقل ضمن طلب واحد
+
+        يعيد لكل حقل منعكس (الرموز الناجية، سياقات الانعكاس). الاستجابة
+        الخاطئة (4xx/5xx) تعيد None ما لم يُسمح بها، فيُعاد الفحص حقلًا حقلًا.
+        """
+        canaries = self.scheduler.make_canaries(fields)
+        test_data = dict(form_data)
+        for name, (_, canary) in canaries.items():
+            test_data[name] = canary
+        response = self.send(form_url, method, test_data)
+        if response is None or (response.status_code >= 400 and not allow_errors):
+            return None
+        found = self.scheduler.reflections(response.text, [token for token, _ in canaries.values()])
+        return {name: found[token] for name, (token, _) in canaries.items() if token in found}
+
+    def payloads_for(self, contexts):
+        """الحمولات المرتبة حسب سياقات الانعكاس"""
+        if not contexts or any(context not in self.context_payloads for context in contexts):
+            return self.xss_payloads
+        payloads = []
+        for context in sorted(contexts):
+            payloads.extend(p for p in self.context_payloads[context] if p not in payloads)
+        return payloads
+
+    def test_xss_in_field(self, form_url, method, form_data, input_name, url, action, reflection=None):
+        """اختبار XSS في حقل واحد من النموذج
+
+        reflection نتيجة المسبار المجمّع للحقل إن وُجدت، فلا يُرسل مسبار خاص به.
+        """
+        # مفتاح المجس في حالة المسح: الطريقة وعنوان الإرسال والصفحة المصدر
+        endpoint = f'{method.upper()} {form_url} {url}'
+        if self.state.probe_done('xss', endpoint, input_name):
+            return False
+
+        if reflection is None and self.scheduler.canary:
+            try:
+                reflection = self.probe_canary(form_url, method, form_data, input_name)
+            except Exception as e:
+                self.console.print(f'[red]Error testing form at {url}: {str(e)}[/red]')
+                return False
+
+            # الحقل لا يعكس المدخلات: لا فائدة من إرسال الحمولات
+            if reflection is None:
+                self.scheduler.skip()
+                self.state.mark_probe('xss', endpoint, input_name)
+                return False
+
+        if reflection is not None:
+            allowed_chars, contexts = reflection
+            payloads = self.scheduler.schedule(self.payloads_for(contexts), allowed_chars)
+        else:
+            payloads = self.scheduler.schedule(self.xss_payloads)
+
+        for payload in payloads:
+            if self.state.probe_done('xss', endpoint, input_name, payload):
+                continue
+            test_data = dict(form_data)
+            test_data[input_name] = payload
+
+            try:
+                response = self.send(form_url, method, test_data, until=payload)
+                if response is None:
+                    return False
+
+                # التحقق من وجود payload في الاستجابة
+                if payload in response.text:
+                    self.add_finding({
+                        'type': 'XSS',
+                        'url': url,
+                        'method': method,
+                        'form_action': action,
+                        'vulnerable_parameter': input_name,
+                        'payload': payload,
+                        'pages': self.shared_pages.get((method.lower(), form_url, url), [url])
+                    })
+                    # التوقف بعد العثور على ثغرة في هذا الحقل
+                    self.state.mark_probe('xss', endpoint, input_name)
+                    return True
+                self.state.mark_probe('xss', endpoint, input_name, payload)
+
+            except Exception as e:
+                self.console.print(f'[red]Error testing form at {url}: {str(e)}[/red]')
+
+        self.state.mark_probe('xss', endpoint, input_name)
+        return False
+
+    async def test_xss_in_form(self, form, on_field=None):
+        """اختبار XSS في النموذج، مع استدعاء on_field بعد كل حقل"""
+        action = form['action']
+        method = form['method']
+        form_url = form['url']
 
         # تجميع بيانات النموذج
-        form_data = {}
-        for input_field in inputs:
-            input_name = input_field.get('name')
-            input_type = input_field.get('type', 'text')
-            
-            if input_name:
-                if input_type == 'submit':
-                    form_data[input_name] = input_field.get('value', '')
-                else:
-                    # اختبار كل payload في كل حقل
-                    for payload in self.xss_payloads:
-                        form_data[input_name] = payload
-                        
-                        try:
-                            if method == 'post':
-                                response = requests.post(
-                                    urljoin(url, action),
-                                    data=form_data,
-                                    headers=self.headers,
-                                    allow_redirects=False
-                                )
-                            else:
-                                response = requests.get(
-                                    urljoin(url, action),
-                                    params=form_data,
-                                    headers=self.headers,
-                                    allow_redirects=False
-                                )
-
-                            # التحقق من وجود payload في الاستجابة
-                            if payload in response.text:
-                                self.vulnerabilities.append({
-                                    'type': 'XSS',
-                                    'url': url,
-                                    'method': method,
-                                    'form_action': action,
-                                    'vulnerable_parameter': input_name,
-                                    'payload': payload
-                                })
-                                # التوقف بعد العثور على ثغرة
-                                return
-
-                        except Exception as e:
-                            self.console.print(f'[red]Error testing form at {url}: {str(e)}[/red]')
-
-    def scan_url(self, url):
-        """فحص URL واحد"""
-        if url in self.visited_urls:
-            return
+        form_data = {input_field['name']: input_field['value'] for input_field in form['inputs']}
+        fields = self.form_fields(form)
+        reflections = None
 
-        self.visited_urls.add(url)
-        forms = self.extract_forms(url)
-
-        for form in forms:
-            self.test_xss_in_form(form, url)
-
-    def crawl_and_scan(self, url, max_urls=10):
-        """تصفح الموقع وفحص الصفحات"""
-        try:
-            response = requests.get(url, headers=self.headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # استخراج جميع الروابط
-            links = soup.find_all('a')
-            for link in links:
-                href = link.get('href')
-                if href and not href.startswith('#'):
-                    absolute_url = urljoin(url, href)
-                    if self.is_same_domain(absolute_url) and len(self.visited_urls) < max_urls:
-                        self.scan_url(absolute_url)
-
-        except Exception as e:
-            self.console.print(f'[red]Error crawling {url}: {str(e)}[/red]')
-
-    def scan(self):
-        """تنفيذ المسح الكامل"""
-        url = self.normalize_url(self.target)
-        
-        with Progress() as progress:
-            task = progress.add_task('[cyan]Scanning for XSS vulnerabilities...', total=100)
-            
-            # فحص الصفحة الرئيسية أولاً
-            self.scan_url(url)
-            progress.update(task, advance=50)
-            
-            # تصفح وفحص الصفحات الأخرى
-            self.crawl_and_scan(url)
-            progress.update(task, advance=50)
+        endpoint = f'{method.upper()} {form_url} {form["page"]}'
+        pending = [name for name in fields if not self.state.probe_done('xss', endpoint, name)]
+        if self.pack_fields and self.scheduler.canary and pending:
+            try:
+                reflections = await self.engine.submit(
+                    host_of(form_url), self.probe_fields, form_url, method, form_data, pending
+                )
+            except Exception as e:
+                self.console.print(f'[red]Error testing form at {form["page"]}: {str(e)}[/red]')
+                return
+
+        async def test_field(input_name):
+            if reflections is not None and input_name in pending and input_name not in reflections:
+                # الحقل لم يعكس رمزه في المسبار المجمّع
+                self.scheduler.skip()
+                self.state.mark_probe('xss', endpoint, input_name)
+            else:
+                await self.engine.submit(
+                    host_of(form_url), self.test_xss_in_field,
+                    form_url, method, form_data, input_name, form['page'], action,
+                    reflections.get(input_name) if reflections is not None else None
+                )
+            if on_field:
+                on_field()
+
+        # اختبار الحقول المنعكسة فقط بالتوازي
+        await self.engine.gather(test_field(input_name) for input_name in fields)
+
+    @staticmethod
+    def form_fields(form):
+        """حقول النموذج القابلة للاختبار"""
+        return [field['name'] for field in form['inputs'] if field['type'] != 'submit']
+
+    async def crawl(self):
+        """بناء خريطة الموقع عند عدم تمريرها من الخارج"""
+        crawler = Crawler(
+            self.target, client=self.client, engine=self.engine, max_pages=self.max_urls
+        )
+        return await crawler.crawl_async()
+
+    async def scan_async(self, site_map=None):
+        """تنفيذ المسح الكامل بشكل غير متزامن"""
+        with progress_bar(self.progress) as progress:
+            if site_map is None:
+                crawl_task = progress.add_task('[cyan]Crawling target...', total=1)
+                site_map = await self.crawl()
+                progress.update(crawl_task, advance=1)
+
+            self.visited_urls.update(site_map.pages)
+            # النماذج الفريدة فقط: النموذج المكرر في عدة صفحات يُختبر مرة واحدة
+            self.forms = site_map.forms
+            for form in self.forms:
+                key = (form['method'].lower(), form['url'], form['page'])
+                self.shared_pages[key] = form.get('pages', [form['page']])
+
+            # التقدم بعدد الحقول المختبرة لا بعدد النماذج
+            task = progress.add_task(
+                '[cyan]Scanning for XSS vulnerabilities...',
+                total=sum(len(self.form_fields(form)) for form in self.forms)
+            )
+            await self.engine.gather(
+                self.test_xss_in_form(form, lambda: progress.update(task, advance=1))
+                for form in self.forms
+            )
 
         return self.vulnerabilities
 
+    def scan(self, site_map=None):
+        """تنفيذ المسح الكامل"""
+        return self.engine.run(self.scan_async(site_map))
+
     def generate_report(self):
         """إنشاء تقرير بنتائج المسح"""
         self.console.print('\n[bold green]===== XSS Scan Report =====[/bold green]')
@@ -164,4 +280,6 @@ class XSSScanner:
             self.console.print(f'Method: {vuln["method"].upper()}')
             self.console.print(f'Form Action: {vuln["form_action"]}')
             self.console.print(f'Vulnerable Parameter: {vuln["vulnerable_parameter"]}')
+            if len(vuln.get('pages', [])) > 1:
+                self.console.print(f'Form found on {len(vuln["pages"])} pages: {", ".join(vuln["pages"][:5])}')
             self.console.print(f'Payload: {vuln["payload"]}\n')
\ No newline at end of file
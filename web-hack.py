@@ -36,7 +36,47 @@ class WebHack:
                           default='quick',
                           help='Type of scan to perform')
         parser.add_argument('-o', '--output',
-                          help='Output file for scan results')
+                          help='Output file for scan results, written as findings are found')
+        parser.add_argument('--format',
+                          choices=['jsonl', 'sarif'],
+                          help='Output format (default: from the file extension, else jsonl)')
+        parser.add_argument('--scanners',
+                          help='Comma separated scanners for custom scans '
+                               '(ports,vulnerability,xss,sqli,directory)')
+        parser.add_argument('--rate', type=float, default=20,
+                          help='Maximum requests per second per host')
+        parser.add_argument('--concurrency', type=int, default=20,
+                          help='Maximum concurrent requests')
+        parser.add_argument('--stage-timeout', type=float,
+                          help='Timeout in seconds for each scan stage')
+        parser.add_argument('--timeout', type=float,
+                          help='Timeout in seconds for the whole scan')
+        parser.add_argument('-T', '--targets-file',
+                          help='Scope file with one authorized target per line (batch mode)')
+        parser.add_argument('--workers', type=int, default=4,
+                          help='Number of targets scanned in parallel in batch mode')
+        parser.add_argument('--batch-mode',
+                          choices=['process', 'async'],
+                          default='process',
+                          help='Run batch targets in separate processes or as async tasks')
+        parser.add_argument('--port-method',
+                          choices=['connect', 'nmap'],
+                          default='connect',
+                          help='Built-in async TCP connect scan, or nmap SYN scan (requires root)')
+        parser.add_argument('--version-detection',
+                          choices=['banner', 'nmap', 'none'],
+                          default='banner',
+                          help='Service version detection for open ports')
+        parser.add_argument('--metrics-file',
+                          help='Write scan metrics at the end: Prometheus text for .prom, else JSON')
+        parser.add_argument('--metrics-port', type=int,
+                          help='Serve live metrics on 127.0.0.1:PORT/metrics (Prometheus) and /metrics.json')
+        parser.add_argument('--incremental', action='store_true',
+                          help='Only run injection tests on pages changed since the last completed scan')
+        parser.add_argument('--resume', metavar='SCAN_ID',
+                          help='Resume an interrupted scan, skipping completed work')
+        parser.add_argument('--state-db',
+                          help='Scan state database used for resuming (default: ~/.web-hack/state.db)')
         return parser
 
     def check_platform(self):
@@ -49,12 +89,123 @@ class WebHack:
         print(self.banner)
         args = self.parser.parse_args()
         
-        if not args.target:
+        if not args.target and not args.targets_file and not args.resume:
             self.parser.print_help()
             sys.exit(1)
-            
-        print(f'Starting scan on {args.target} at {datetime.now()}')
-        # TODO: Implement scanning functionality
+
+        from scanners.orchestrator import ScanOrchestrator
+
+        options = {
+            'port': args.port,
+            'scan_type': args.scan_type,
+            'scanners': args.scanners.split(',') if args.scanners else None,
+            'requests_per_second': args.rate,
+            'concurrency': args.concurrency,
+            'stage_timeout': args.stage_timeout,
+            'timeout': args.timeout,
+            'incremental': args.incremental,
+            'port_method': args.port_method,
+            'version_detection': None if args.version_detection == 'none' else args.version_detection
+        }
+        try:
+            ScanOrchestrator.resolve_scanners(args.scan_type, options['scanners'])
+        except ValueError as e:
+            print(f'Error: {e}')
+            sys.exit(1)
+
+        if args.targets_file:
+            self.run_batch(args, options)
+            return
+
+        sink = None
+        if args.output:
+            from scanners.sink import open_sink
+            try:
+                sink = open_sink(args.output, args.format)
+            except OSError as e:
+                print(f'Error: Cannot open output file: {e}')
+                sys.exit(1)
+
+        state = self.open_state(args, options)
+        target = args.target
+        if args.resume:
+            target, options = state.target, state.options
+            print(f'Resuming scan {state.scan_id} on {target} at {datetime.now()}')
+        else:
+            print(f'Starting scan on {target} at {datetime.now()}')
+            if state:
+                print(f'Scan ID: {state.scan_id} (resume with --resume {state.scan_id})')
+
+        orchestrator = ScanOrchestrator(target, sink=sink, state=state, **options)
+        server = self.serve_metrics(args, orchestrator.metrics)
+        try:
+            orchestrator.run()
+            orchestrator.generate_report()
+        finally:
+            if server:
+                server.shutdown()
+            if args.metrics_file:
+                try:
+                    orchestrator.metrics.write(args.metrics_file)
+                    print(f'Metrics written to {args.metrics_file}')
+                except OSError as e:
+                    print(f'Error: Cannot write metrics file: {e}')
+            if sink:
+                sink.close()
+                print(f'Results written to {args.output}')
+            if state:
+                stages = orchestrator.stages.values()
+                completed = bool(stages) and all(stage.status == 'done' for stage in stages)
+                state.finish('completed' if completed else 'incomplete')
+                state.close()
+
+    def serve_metrics(self, args, metrics):
+        if not args.metrics_port:
+            return None
+        from scanners.metrics import serve_metrics
+
+        try:
+            server = serve_metrics(metrics, args.metrics_port)
+        except OSError as e:
+            print(f'Warning: Metrics endpoint disabled: {e}')
+            return None
+        print(f'Metrics available at http://127.0.0.1:{args.metrics_port}/metrics')
+        return server
+
+    def open_state(self, args, options):
+        from scanners.state import DEFAULT_STATE_PATH, ScanState
+
+        path = args.state_db or DEFAULT_STATE_PATH
+        if args.resume:
+            try:
+                return ScanState.resume(args.resume, path)
+            except ValueError as e:
+                print(f'Error: {e}')
+                sys.exit(1)
+        try:
+            return ScanState.create(args.target, options, path)
+        except Exception as e:
+            # المسح يعمل دون حالة دائمة إن تعذر فتح قاعدة البيانات
+            print(f'Warning: Scan state disabled: {e}')
+            return None
+
+    def run_batch(self, args, options):
+        from scanners.batch import BatchRunner, load_targets
+
+        try:
+            targets = load_targets(args.targets_file)
+        except OSError as e:
+            print(f'Error: Cannot read targets file: {e}')
+            sys.exit(1)
+        if not targets:
+            print('Error: No targets found in targets file')
+            sys.exit(1)
+
+        output = args.output or f'web-hack-batch-{datetime.now():%Y%m%d-%H%M%S}.jsonl'
+        print(f'Starting batch scan of {len(targets)} targets at {datetime.now()}')
+        runner = BatchRunner(targets, output, workers=args.workers, mode=args.batch_mode, **options)
+        runner.run()
+        runner.generate_report()
 
 def main():
     scanner = WebHack()